@@ -0,0 +1,93 @@
+"""Compare forecast aggregation against the original first-slot-per-day loop.
+
+Runs on a synthetic 40-slot /forecast response, so no API key or network
+access is needed:
+
+    python benchmarks/bench_forecast.py [--number N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forecast import aggregate  # noqa: E402
+
+ICONS = ["01d", "02d", "03d", "04d", "09d", "10d", "01n", "02n", "10n"]
+
+
+def make_payload(slots=40, tz_offset=3600, seed=0):
+    """A /forecast response shaped like the real one"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    entries = []
+    for i in range(slots):
+        when = start + timedelta(hours=3 * i)
+        entry = {
+            "dt": int(when.timestamp()),
+            "dt_txt": when.strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {"temp": round(rng.uniform(-5, 25), 2)},
+            "weather": [{"icon": rng.choice(ICONS), "description": "scattered clouds"}],
+        }
+        if rng.random() < 0.3:
+            entry["rain"] = {"3h": round(rng.uniform(0, 4), 2)}
+        entries.append(entry)
+    return {"cod": "200", "list": entries, "city": {"timezone": tz_offset}}
+
+
+def legacy_daily(data):
+    """The loop get_forecast() used before, minus its debug prints"""
+    daily_forecast = []
+    seen_dates = set()
+    for entry in data.get("list", []):
+        dt_txt = entry.get("dt_txt", "")
+        if not dt_txt:
+            continue
+        dt = datetime.strptime(dt_txt, "%Y-%m-%d %H:%M:%S")
+        date_str = dt.strftime("%Y-%m-%d")
+        if date_str in seen_dates:
+            continue
+        seen_dates.add(date_str)
+        daily_forecast.append({
+            "date": dt.strftime("%a, %d %b"),
+            "temp": entry.get("main", {}).get("temp", "N/A"),
+            "icon": entry.get("weather", [{}])[0].get("icon", "02d"),
+            "weather": entry.get("weather", [{}])[0].get("description", "N/A")
+        })
+        if len(daily_forecast) >= 5:
+            break
+    return daily_forecast
+
+
+def aggregated_daily(data):
+    _, daily = aggregate(data)
+    return daily.records(limit=5)
+
+
+def bench(name, func, payload, number, repeat=5):
+    best = min(timeit.repeat(lambda: func(payload), number=number, repeat=repeat))
+    per_call = best / number * 1e6
+    print(f"{name:<12} {per_call:8.1f} µs/call")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args()
+
+    payload = make_payload()
+    legacy = bench("legacy", legacy_daily, payload, args.number)
+    current = bench("aggregate", aggregated_daily, payload, args.number)
+    print(f"speedup      {legacy / current:8.2f}x")
+
+    for day in aggregated_daily(payload):
+        print(f"  {day.date}: {day.temp_min:.1f} .. {day.temp_max:.1f} °C, "
+              f"{day.precipitation:.1f} mm, {day.icon}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Memory held per city: decoded JSON dicts versus weather_records.
+
+Parses the fixture /weather and /forecast responses for --cities distinct
+cities, keeping either what the caches used to hold (the decoded /weather
+payload and one dict per forecast day) or the CurrentConditions and
+ForecastDay records they hold now, and reports the bytes retained per city
+as measured by tracemalloc. Parse time per city (JSON decoding, forecast
+aggregation and building the kept objects) is also reported, as the best of
+--repeat warmed-up runs in alternating order. No API key or network access
+is needed:
+
+    python benchmarks/bench_records.py [--cities N] [--repeat N]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from forecast import aggregate  # noqa: E402
+from weather_records import CurrentConditions  # noqa: E402
+
+# Days kept per forecast, as in weather_core
+FORECAST_DAYS = 5
+
+
+def load_fixture(name):
+    with open(os.path.join(HERE, "fixtures", name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_responses(cities):
+    """(weather JSON, forecast JSON) response bodies, one pair per city"""
+    weather = load_fixture("weather.json")
+    forecast = load_fixture("forecast.json")
+    responses = []
+    for i in range(cities):
+        weather.update(id=1000000 + i, name=f"Bench City {i}")
+        weather["main"]["temp"] = round(10 + i % 170 / 10, 2)
+        forecast["city"].update(id=1000000 + i, name=f"Bench City {i}")
+        responses.append((json.dumps(weather), json.dumps(forecast)))
+    return responses
+
+
+def day_dicts(daily, limit):
+    """The day dicts the forecast cache held before records"""
+    return [
+        {
+            "date": daily.label(i),
+            "temp": daily.temp_max[i],
+            "temp_min": daily.temp_min[i],
+            "temp_max": daily.temp_max[i],
+            "temp_mean": daily.temp_mean[i],
+            "precipitation": daily.precipitation[i],
+            "icon": daily.icons[i],
+            "weather": daily.descriptions[i],
+        }
+        for i in range(min(limit, len(daily.days)))
+    ]
+
+
+def as_dicts(weather_body, forecast_body):
+    _, daily = aggregate(json.loads(forecast_body))
+    return json.loads(weather_body), day_dicts(daily, FORECAST_DAYS)
+
+
+def as_records(weather_body, forecast_body):
+    _, daily = aggregate(json.loads(forecast_body))
+    return (CurrentConditions.from_payload(json.loads(weather_body)),
+            daily.records(limit=FORECAST_DAYS))
+
+
+def parse_times(parsers, responses, repeat):
+    """{name: best seconds per city} over repeat runs of each parser.
+
+    Runs without tracemalloc, which slows allocation down a lot. The order
+    alternates between rounds so neither parser always runs on a cache or
+    allocator warmed up by the other; one untimed round warms up both.
+    """
+    best = {}
+    for round_ in range(repeat + 1):
+        order = parsers if round_ % 2 else parsers[::-1]
+        for name, parse in order:
+            started = time.perf_counter()
+            for bodies in responses:
+                parse(*bodies)
+            elapsed = time.perf_counter() - started
+            if round_:
+                best[name] = min(best.get(name, elapsed), elapsed)
+    return {name: seconds / len(responses) for name, seconds in best.items()}
+
+
+def measure(parse, responses):
+    """(bytes retained per city for current, forecast)"""
+    gc.collect()
+    tracemalloc.start()
+    parsed = [parse(*bodies) for bodies in responses]
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0]
+    current = [entry[0] for entry in parsed]
+    del parsed
+    gc.collect()
+    current_only = tracemalloc.get_traced_memory()[0]
+    del current
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    cities = len(responses)
+    # Dropping the forecasts leaves the current conditions (and the list
+    # holding them); dropping those leaves the baseline
+    return (current_only - baseline) / cities, (total - current_only) / cities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=2000, help="distinct cities parsed")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per parser")
+    args = parser.parse_args()
+
+    responses = make_responses(args.cities)
+    parsers = [("dicts", as_dicts), ("records", as_records)]
+    memory = {name: measure(parse, responses) for name, parse in parsers}
+    times = parse_times(parsers, responses, args.repeat)
+
+    print(f"{args.cities} cities, bytes retained per city:")
+    print(f"{'':<10} {'current':>9} {'forecast':>9} {'total':>9} {'parse µs':>9}")
+    for name, (current, forecast) in memory.items():
+        print(f"{name:<10} {current:9.0f} {forecast:9.0f} {current + forecast:9.0f} "
+              f"{times[name] * 1e6:9.1f}")
+    dicts, records = memory["dicts"], memory["records"]
+    print(f"records use {sum(records) / sum(dicts):.0%} of the memory of dicts, "
+          f"parse time {times['records'] / times['dicts']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Load test for server.py: many concurrent keep-alive clients, few upstream calls.
+
+Starts the mock API (mock_server.py) in-process and the weather service as a
+subprocess pointed at it, then opens --clients connections that each make
+--requests lookups spread over --cities cities. Reports throughput, latency
+percentiles and how many requests actually reached the (mock) upstream.
+
+    python benchmarks/bench_service.py --clients 2000 --requests 5 --cities 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from mock_server import MockConfig, MockServer  # noqa: E402
+from run_benchmarks import percentile  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def raise_fd_limit():
+    """Each client needs a socket on both ends"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY
+                                                    else 65536, hard))
+
+
+async def request(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    body = await reader.readexactly(length)
+    return status, body
+
+
+async def client(port, index, requests, cities, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i in range(requests):
+            city = f"Bench City {(index + i) % cities}"
+            route = "forecast" if i % 2 else "weather"
+            started = time.perf_counter()
+            status, _ = await request(reader, writer, f"/{route}?city={city.replace(' ', '+')}")
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def fetch_json(port, target):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return json.loads((await request(reader, writer, target))[1])
+    finally:
+        writer.close()
+
+
+async def wait_ready(port, proc, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Weather service exited during start-up")
+        try:
+            await fetch_json(port, "/health")
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Weather service did not start")
+
+
+async def run(args, port, proc):
+    await wait_ready(port, proc)
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, i, args.requests, args.cities, latencies, statuses)
+                           for i in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    stats = await fetch_json(port, "/stats")
+    return latencies, statuses, elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=5, help="requests per client")
+    parser.add_argument("--cities", type=int, default=50, help="distinct cities asked for")
+    parser.add_argument("--upstream", type=int, default=8, help="service upstream concurrency")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="mock API latency")
+    args = parser.parse_args()
+    raise_fd_limit()
+
+    mock = MockServer(config=MockConfig(args.latency_ms)).start()
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ)
+        env.update(mock.app_env())
+        env.update({
+            "WEATHER_API_KEY": "benchmark",
+            "WEATHER_STORE_PATH": os.path.join(workdir, "service.db"),
+            "CITY_INDEX_PATH": os.path.join(workdir, "no-city-index"),
+            "OWM_DAILY_QUOTA": "0",
+            "OWM_RATE_PER_MINUTE": "600000",
+            "WEATHER_LOG_LEVEL": "ERROR",
+        })
+        env.pop("WEATHER_SERVICE_URL", None)
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "server.py"), "--port", str(port),
+             "--upstream", str(args.upstream)],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL
+        )
+        try:
+            latencies, statuses, elapsed, stats = asyncio.run(run(args, port, proc))
+        finally:
+            proc.terminate()
+            proc.wait()
+    mock.shutdown()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.clients} clients x {args.requests} requests over {args.cities} cities "
+          f"in {elapsed:.2f}s: {total / elapsed:.0f} requests/s")
+    print(f"latency ms: p50 {percentile(latencies, 50) * 1000:.1f}  "
+          f"p95 {percentile(latencies, 95) * 1000:.1f}  "
+          f"p99 {percentile(latencies, 99) * 1000:.1f}")
+    print(f"statuses: {dict(sorted(statuses.items()))}")
+    print(f"upstream requests: {mock.config.requests} "
+          f"(cache hits {stats['cache_hits']}, coalesced {stats['coalesced']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measure GUI cold start: import cost and time to first paint.
+
+Launches gui_app.py under `python -X importtime` with
+WEATHER_EXIT_AFTER_PAINT=1, so the app exits as soon as its window has been
+drawn. Needs a display (or e.g. xvfb-run):
+
+    python benchmarks/bench_startup.py [--runs N] [--top N]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time: self [us] | cumulative | imported package"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once():
+    """Return (wall ms, first paint ms, {top-level module: cumulative us})"""
+    env = dict(os.environ, WEATHER_EXIT_AFTER_PAINT="1", WEATHER_WARM_ICONS="0")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "gui_app.py"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    match = re.search(r"first_paint_ms=([\d.]+)", proc.stdout)
+    if proc.returncode != 0 or match is None:
+        raise RuntimeError(f"gui_app.py failed to start:\n{proc.stderr[-2000:]}")
+
+    imports = {}
+    for line in proc.stderr.splitlines():
+        found = IMPORT_LINE.match(line)
+        # Only the modules gui_app.py imports itself
+        if found and len(found.group(3)) <= 1:
+            imports[found.group(4)] = int(found.group(2))
+    return wall_ms, float(match.group(1)), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to measure")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    walls, paints, imports = [], [], {}
+    for _ in range(args.runs):
+        wall_ms, paint_ms, run_imports = run_once()
+        walls.append(wall_ms)
+        paints.append(paint_ms)
+        for module, us in run_imports.items():
+            imports.setdefault(module, []).append(us)
+
+    print(f"process wall time  median {statistics.median(walls):7.1f} ms")
+    print(f"first paint        median {statistics.median(paints):7.1f} ms "
+          f"(from the start of gui_app.py)")
+    print("\nslowest top-level imports (median cumulative):")
+    ranked = sorted(imports.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for module, times in ranked[:args.top]:
+        print(f"  {statistics.median(times) / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Local stand-in for the OpenWeatherMap and IP geolocation APIs.
+
+Serves the recorded payloads in benchmarks/fixtures with configurable
+latency and error injection, so the app can be benchmarked without network
+access or API keys. Routes:
+
+    /data/2.5/weather?q=NAME | ?id=ID     current weather (fixture, renamed)
+    /data/2.5/group?id=ID,ID,...          current weather for several IDs
+    /data/2.5/forecast?q=NAME | ?id=ID    5-day / 3-hour forecast
+    /img/wn/CODE@2x.png                   weather icon (a small PNG)
+    /ipapi/json/  /ipinfo/json            IP geolocation
+    /ipify                                public IP as plain text
+
+A city called "Nowhere" gets a 404, like an unknown city does upstream.
+Run standalone for manual testing:
+
+    python benchmarks/mock_server.py --port 8765 --latency-ms 50 --error-rate 0.05
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PUBLIC_IP = "203.0.113.7"
+ICON_ETAG = '"mock-icon"'
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_png(size=4, rgba=(255, 200, 0, 255)):
+    """A tiny solid-colour PNG, standing in for an icon"""
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+    rows = b"".join(b"\x00" + bytes(rgba) * size for _ in range(size))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows))
+            + chunk(b"IEND", b""))
+
+
+def city_id(name):
+    """Stable fake OpenWeatherMap ID for a city name"""
+    return zlib.crc32(name.casefold().encode()) % 9_000_000 + 1_000_000
+
+
+class MockConfig:
+    """Behaviour knobs, changeable while the server runs"""
+
+    def __init__(self, latency_ms=20.0, jitter_ms=5.0, error_rate=0.0, error_status=503):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockWeather/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=()):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        elif isinstance(body, str):
+            body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        config = self.server.config
+        with config.lock:
+            config.requests += 1
+            fail = random.random() < config.error_rate
+            if fail:
+                config.errors += 1
+        delay = max(0.0, random.gauss(config.latency_ms, config.jitter_ms)) / 1000
+        time.sleep(delay)
+        if fail:
+            headers = [("Retry-After", "0")] if config.error_status == 429 else []
+            self._send(config.error_status, {"cod": config.error_status, "message": "injected error"},
+                       headers=headers)
+            return
+
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        route = self.server.routes.get(url.path.rstrip("/"))
+        if route is None and url.path.startswith("/img/wn/"):
+            route = MockHandler.icon
+        if route is None:
+            self._send(404, {"cod": "404", "message": "unknown route"})
+            return
+        route(self, query)
+
+    def _city(self, query):
+        """Resolve ?q= or ?id= to (name, id), or None after sending a 404"""
+        if "id" in query:
+            return self.server.names.get(int(query["id"]), f"City {query['id']}"), int(query["id"])
+        name = query.get("q", "").split(",")[0].strip().title()
+        if not name or name == "Nowhere":
+            self._send(404, {"cod": "404", "message": "city not found"})
+            return None
+        return name, city_id(name)
+
+    def _weather_for(self, name, ident):
+        payload = copy.deepcopy(self.server.weather)
+        payload["name"] = name
+        payload["id"] = ident
+        payload["dt"] = int(time.time()) // 600 * 600
+        self.server.names[ident] = name
+        return payload
+
+    def weather(self, query):
+        city = self._city(query)
+        if city is not None:
+            self._send(200, self._weather_for(*city))
+
+    def group(self, query):
+        ids = [int(i) for i in query.get("id", "").split(",") if i.strip()]
+        entries = [self._weather_for(self.server.names.get(i, f"City {i}"), i) for i in ids]
+        self._send(200, {"cnt": len(entries), "list": entries})
+
+    def forecast(self, query):
+        city = self._city(query)
+        if city is not None:
+            payload = copy.deepcopy(self.server.forecast)
+            payload["city"]["name"], payload["city"]["id"] = city
+            self._send(200, payload)
+
+    def icon(self, query):
+        if self.headers.get("If-None-Match") == ICON_ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ICON_ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, self.server.icon, content_type="image/png",
+                   headers=[("ETag", ICON_ETAG)])
+
+    def ipapi(self, query):
+        self._send(200, self.server.ipapi)
+
+    def ipinfo(self, query):
+        self._send(200, self.server.ipinfo)
+
+    def ipify(self, query):
+        self._send(200, PUBLIC_IP, content_type="text/plain")
+
+
+class MockServer(ThreadingHTTPServer):
+    """Mock API server; start() runs it on a daemon thread"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, config=None):
+        super().__init__(("127.0.0.1", port), MockHandler)
+        self.config = config or MockConfig()
+        self.weather = load_fixture("weather.json")
+        self.forecast = load_fixture("forecast.json")
+        self.ipapi = load_fixture("ipapi.json")
+        self.ipinfo = load_fixture("ipinfo.json")
+        self.icon = make_png()
+        self.names = {}
+        self.routes = {
+            "/data/2.5/weather": MockHandler.weather,
+            "/data/2.5/group": MockHandler.group,
+            "/data/2.5/forecast": MockHandler.forecast,
+            "/ipapi/json": MockHandler.ipapi,
+            "/ipinfo/json": MockHandler.ipinfo,
+            "/ipify": MockHandler.ipify,
+        }
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def app_env(self):
+        """Environment variables pointing the app at this server"""
+        return {
+            "OWM_API_URL": f"{self.url}/data/2.5",
+            "OWM_ICON_URL": f"{self.url}/img/wn/{{}}@2x.png",
+            "IPAPI_URL": f"{self.url}/ipapi/json/",
+            "IPINFO_URL": f"{self.url}/ipinfo/json",
+            "PUBLIC_IP_URL": f"{self.url}/ipify",
+            "LOCATION_PROVIDERS": "ipapi,ipinfo",
+        }
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mock weather API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    server = MockServer(args.port, MockConfig(args.latency_ms, args.jitter_ms,
+                                              args.error_rate, args.error_status))
+    print(f"Mock API on {server.url}; point the app at it with:")
+    for name, value in server.app_env().items():
+        print(f"  export {name}='{value}'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Offline benchmark suite for the CLI and GUI code paths.
+
+Starts benchmarks/mock_server.py in-process and runs each scenario in a
+fresh Python process pointed at it, so results do not depend on the
+network, API keys or what an earlier scenario left in memory. Per
+scenario it reports p50/p95/p99 latency, throughput and the peak RSS of
+the scenario's process.
+
+    python benchmarks/run_benchmarks.py                    # every scenario
+    python benchmarks/run_benchmarks.py single_lookup batch_lookup
+    python benchmarks/run_benchmarks.py --latency-ms 80 --error-rate 0.05
+    python benchmarks/run_benchmarks.py --save-baseline    # record a baseline
+    python benchmarks/run_benchmarks.py --check            # fail on regressions
+
+--check compares against the stored baseline (benchmarks/baseline.json by
+default) and exits with status 1 when any scenario's p95 latency or peak
+RSS grew, or its throughput fell, by more than --tolerance. Baselines are
+machine-specific: record one on the machine that runs the gate.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+# Relative slowdown tolerated by --check
+DEFAULT_TOLERANCE = 0.25
+
+BATCH_SIZE = 50
+
+
+# Scenarios. Each runs in its own process (see run_worker) and yields
+# (seconds, items) per operation.
+
+def scenario_single_lookup(iterations):
+    """Current weather and forecast for one city, bypassing the cache, like a GUI search"""
+    from weather_core import weather_client
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        weather_client.weather("London", use_cache=False)
+        weather_client.forecast("London", use_cache=False)
+        yield time.perf_counter() - started, 1
+
+
+def scenario_batch_lookup(iterations):
+    """main.py batch mode over BATCH_SIZE cities with a cold cache"""
+    import main
+    from weather_cache import weather_cache
+
+    cities = [f"Benchmark City {i}" for i in range(BATCH_SIZE)]
+    for _ in range(iterations):
+        weather_cache.clear()
+        started = time.perf_counter()
+        with contextlib.redirect_stderr(io.StringIO()):
+            # No --rate pacing: it would dominate the timings and hide the
+            # code under test (the mock server has no limit to respect)
+            main.run_batch(cities, rate=0, out=io.StringIO())
+        yield time.perf_counter() - started, len(cities)
+
+
+def scenario_toggle(iterations):
+    """Unit and theme toggles re-formatting a displayed city and forecast"""
+    from weather_view import WeatherViewModel
+
+    class Widget:
+        __slots__ = ("options",)
+
+        def __init__(self):
+            self.options = {}
+
+        def config(self, **options):
+            self.options.update(options)
+
+    light = {"surface": "#ffffff", "text_primary": "#0d47a1", "card_bg": "#ffffff"}
+    dark = {"surface": "#1e1e1e", "text_primary": "#e3f2fd", "card_bg": "#2d2d2d"}
+    view = WeatherViewModel(light)
+    # Roughly what the current-conditions section and five cards bind
+    for i in range(60):
+        view.bind_colors(Widget(), bg="surface", fg="text_primary")
+    for i in range(10):
+        view.bind_temp(Widget(), (14.6 + i, 9.2 + i), "{} / {}", decimals=0)
+
+    use_celsius = True
+    for i in range(iterations):
+        use_celsius = not use_celsius
+        started = time.perf_counter()
+        view.apply_units(use_celsius)
+        view.apply_theme(dark if i % 2 else light)
+        yield time.perf_counter() - started, 1
+
+
+def scenario_auto_detect(iterations):
+    """Racing the IP geolocation providers, as the Auto Detect button does"""
+    from location import detect_city
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        city, _, error = detect_city()
+        if city is None:
+            raise RuntimeError(f"Auto-detect failed: {error}")
+        yield time.perf_counter() - started, 1
+
+
+def scenario_icon_sync(iterations):
+    """download_icons.py: a full download, then conditional re-checks"""
+    import download_icons
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            download_icons.download_icons()
+        yield time.perf_counter() - started, len(download_icons.icon_codes)
+
+
+# name -> (function, default iterations, mock server settings)
+SCENARIOS = {
+    "single_lookup": (scenario_single_lookup, 50, {}),
+    "batch_lookup": (scenario_batch_lookup, 10, {}),
+    "batch_lookup_errors": (scenario_batch_lookup, 5, {"error_rate": 0.05}),
+    "toggle": (scenario_toggle, 2000, {}),
+    "auto_detect": (scenario_auto_detect, 30, {}),
+    "icon_sync": (scenario_icon_sync, 10, {}),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_worker(name, iterations):
+    """Run one scenario in this process and print its result as JSON"""
+    sys.path.insert(0, ROOT)
+    func = SCENARIOS[name][0]
+    latencies = []
+    items = 0
+    started = time.perf_counter()
+    for seconds, count in func(iterations):
+        latencies.append(seconds)
+        items += count
+    wall = time.perf_counter() - started
+    latencies.sort()
+    print(json.dumps({
+        "ops": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput": items / wall if wall else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+
+def run_scenario(name, iterations, server, workdir):
+    """Run a scenario in a child process against server; returns its result"""
+    env = dict(os.environ)
+    env.update(server.app_env())
+    env.update({
+        "WEATHER_API_KEY": "benchmark",
+        "WEATHER_STORE_PATH": os.path.join(workdir, f"{name}.db"),
+        "CITY_INDEX_PATH": os.path.join(workdir, "no-city-index"),
+        "OWM_DAILY_QUOTA": "0",
+        "OWM_RATE_PER_MINUTE": "600000",
+        "WEATHER_LOG_LEVEL": "ERROR",
+    })
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", name,
+         "--iterations", str(iterations)],
+        cwd=workdir, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Scenario {name} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions of results against baseline"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']:.2f} ms vs {base['p95_ms']:.2f} ms")
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']:.1f}/s "
+                               f"vs {base['throughput']:.1f}/s")
+        if (result.get("peak_rss_mb") and base.get("peak_rss_mb")
+                and result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance)):
+            regressions.append(f"{name}: peak RSS {result['peak_rss_mb']:.1f} MiB "
+                               f"vs {base['peak_rss_mb']:.1f} MiB")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("-n", "--iterations", type=int,
+                        help="operations per scenario (default: per scenario)")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="mock server response latency (default 20)")
+    parser.add_argument("--jitter-ms", type=float, default=5.0,
+                        help="standard deviation of the latency (default 5)")
+    parser.add_argument("--error-rate", type=float,
+                        help="fraction of requests answered with an error (default: per scenario)")
+    parser.add_argument("--error-status", type=int, default=503,
+                        help="HTTP status of injected errors (default 503)")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline file for --save-baseline and --check")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with status 1 on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed relative regression (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.worker:
+        run_worker(args.worker, args.iterations)
+        return 0
+
+    sys.path.insert(0, HERE)
+    from mock_server import MockConfig, MockServer
+
+    names = args.scenarios or list(SCENARIOS)
+    server = MockServer(config=MockConfig(args.latency_ms, args.jitter_ms)).start()
+    results = {}
+    print(f"{'scenario':<22}{'ops':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'items/s':>10}{'RSS MiB':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            _, default_iterations, settings = SCENARIOS[name]
+            server.config.error_rate = (args.error_rate if args.error_rate is not None
+                                        else settings.get("error_rate", 0.0))
+            server.config.error_status = args.error_status
+            result = run_scenario(name, args.iterations or default_iterations, server, workdir)
+            results[name] = result
+            rss = f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] else "-"
+            print(f"{name:<22}{result['ops']:>6}{result['p50_ms']:>10.2f}"
+                  f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                  f"{result['throughput']:>10.1f}{rss:>9}")
+    server.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first",
+                  file=sys.stderr)
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
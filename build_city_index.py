@@ -0,0 +1,50 @@
+"""Build the offline city index used by city_index.py.
+
+Reads the OpenWeatherMap city list (city.list.json or city.list.json.gz),
+downloading it first when no file is given, and writes the sorted
+tab-separated index file.
+
+Usage:
+    python build_city_index.py [city.list.json.gz]
+"""
+import gzip
+import json
+import os
+import sys
+
+import http_client
+from city_index import CITY_INDEX_PATH, index_key
+
+CITY_LIST_URL = "https://bulk.openweathermap.org/sample/city.list.json.gz"
+
+
+def load_city_list(path=None):
+    if path is None:
+        print(f"Downloading {CITY_LIST_URL}...")
+        response = http_client.get(CITY_LIST_URL, timeout=(5, 120))
+        response.raise_for_status()
+        return json.loads(gzip.decompress(response.content))
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_index(cities, dest_path=CITY_INDEX_PATH):
+    rows = set()
+    for city in cities:
+        name = " ".join(city.get("name", "").split())
+        if not name or "\t" in name:
+            continue
+        rows.add((index_key(name), name, city.get("country", ""), city["id"]))
+
+    tmp_path = dest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for row in sorted(rows):
+            f.write("\t".join(str(field) for field in row) + "\n")
+    os.replace(tmp_path, dest_path)
+
+    print(f"Wrote {dest_path} ({len(rows)} cities, {os.path.getsize(dest_path) // 1024} KiB)")
+
+
+if __name__ == "__main__":
+    build_index(load_city_list(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,68 @@
+"""Pack every weather icon, pre-resized to the sizes the GUI uses, into one
+atlas file so the GUI can load them all with a single read.
+
+Layout of icons/atlas.bin:
+    ATLAS_MAGIC
+    4-byte little-endian length of the JSON index
+    JSON index: {"sizes": [...], "icons": {"<code>@<size>": [offset, width, height]}}
+    raw RGBA pixel data, addressed by the offsets in the index
+
+Icons missing on disk fall back to their day/night counterpart at pack time;
+codes with neither are left out and the GUI shows its text fallback.
+"""
+import json
+import os
+import struct
+
+from PIL import Image
+
+from download_icons import icon_codes, icon_folder
+from icon_cache import ATLAS_MAGIC, ATLAS_PATH, ICON_SIZES
+
+
+def find_icon_file(code):
+    """Return the PNG to use for code, trying its day/night counterpart next"""
+    counterpart = code[:-1] + ("n" if code.endswith("d") else "d")
+    for candidate in (code, counterpart):
+        path = os.path.join(icon_folder, f"{candidate}.png")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def build_atlas(sizes=ICON_SIZES, dest_path=ATLAS_PATH):
+    index = {}
+    blob = bytearray()
+
+    print("Packing weather icons...")
+
+    for code in icon_codes:
+        path = find_icon_file(code)
+        if path is None:
+            print(f" Missing: {code} (no icon file, skipped)")
+            continue
+        with Image.open(path) as source:
+            icon_image = source.convert("RGBA")
+        for size in sizes:
+            pixels = icon_image.resize((size, size), Image.Resampling.LANCZOS).tobytes()
+            index[f"{code}@{size}"] = [len(blob), size, size]
+            blob += pixels
+        if path.endswith(f"{code}.png"):
+            print(f" Packed: {code}")
+        else:
+            print(f" Packed: {code} (using {os.path.basename(path)})")
+
+    header = json.dumps({"sizes": list(sizes), "icons": index}).encode("utf-8")
+    tmp_path = dest_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(ATLAS_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(blob)
+    os.replace(tmp_path, dest_path)
+
+    print(f"\n Wrote {dest_path} ({len(index)} images, {len(blob) // 1024} KiB)")
+
+
+if __name__ == "__main__":
+    build_atlas()
@@ -0,0 +1,183 @@
+"""Offline index of OpenWeatherMap city names.
+
+Built by build_city_index.py from the OWM city list. The index is a text file
+of tab-separated "key, name, country, id" lines sorted by key, where key is
+the accent-, case- and whitespace-folded name. It is read in one go into
+sorted lists, so exact lookups and prefix completion are binary searches,
+and fuzzy correction only compares names that share the first letters of
+the query.
+
+Without an index file everything here reports "unknown" and callers fall
+back to sending the name to the API as typed.
+"""
+import difflib
+import os
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+from dotenv import load_dotenv
+
+from weather_cache import normalize_city
+from weather_logging import get_logger
+
+load_dotenv()
+
+log = get_logger(__name__)
+
+CITY_INDEX_PATH = os.getenv(
+    "CITY_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cities.idx")
+)
+
+# How similar (0-1) a name must be to count as a likely typo
+FUZZY_CUTOFF = 0.8
+
+City = namedtuple("City", "name country id")
+
+
+class UnknownCity(LookupError):
+    """Raised instead of sending the API a name the index does not know"""
+
+    def __init__(self, query, suggestions=()):
+        self.query = query
+        self.suggestions = list(suggestions)
+        hint = f" (did you mean {city_label(self.suggestions[0])}?)" if self.suggestions else ""
+        super().__init__(f"City not found: {query}{hint}")
+
+
+def index_key(name):
+    """Fold accents, case and whitespace: " São  PAULO" -> "sao paulo" """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return normalize_city(stripped)
+
+
+def split_query(query):
+    """Split "London, GB" into ("london", "GB"); the country is optional"""
+    name, country = query, None
+    if "," in query:
+        head, tail = query.rsplit(",", 1)
+        if len(tail.strip()) == 2 and tail.strip().isalpha():
+            name, country = head, tail.strip().upper()
+    return index_key(name), country
+
+
+def city_label(city):
+    """Unambiguous display name, also accepted by the API: "London, GB" """
+    return f"{city.name}, {city.country}" if city.country else city.name
+
+
+class CityIndex:
+    """Sorted, in-memory city name index"""
+
+    def __init__(self, path=CITY_INDEX_PATH):
+        self.path = path
+        self._keys = []
+        self._lines = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read the index file; safe to call repeatedly or from a warm-up thread"""
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            except FileNotFoundError:
+                lines = []
+            except OSError as e:
+                log.error("Error reading city index: %s", e)
+                lines = []
+            self._keys = [line.split("\t", 1)[0] for line in lines]
+            self._lines = lines
+            self._loaded = True
+
+    def __len__(self):
+        self.load()
+        return len(self._keys)
+
+    def _city(self, i):
+        _, name, country, city_id = self._lines[i].split("\t")
+        return City(name, country, int(city_id))
+
+    def _prefix_range(self, prefix):
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\uffff", start)
+        return start, end
+
+    def lookup(self, query):
+        """Every city whose name matches query exactly (after folding)"""
+        self.load()
+        key, country = split_query(query)
+        start = bisect_left(self._keys, key)
+        matches = []
+        for i in range(start, len(self._keys)):
+            if self._keys[i] != key:
+                break
+            city = self._city(i)
+            if country is None or city.country == country:
+                matches.append(city)
+        return matches
+
+    def complete(self, prefix, limit=8):
+        """Cities whose name starts with prefix, shortest names first"""
+        self.load()
+        key = index_key(prefix)
+        if not key:
+            return []
+        start, end = self._prefix_range(key)
+        # Nearest matches (shortest keys) first; scan a bounded window
+        window = sorted(range(start, min(end, start + limit * 50)),
+                        key=lambda i: len(self._keys[i]))
+        return [self._city(i) for i in window[:limit]]
+
+    def correct(self, query, limit=3):
+        """Likely intended names for a misspelt query, best first"""
+        self.load()
+        key, country = split_query(query)
+        if len(key) < 3:
+            return []
+        # Typos are rarely in the first two letters, and a close match has
+        # a similar length; that leaves a few hundred names to compare
+        start, end = self._prefix_range(key[:2])
+        candidates = sorted({k for k in self._keys[start:end]
+                             if abs(len(k) - len(key)) <= 2})
+        matches = []
+        for match in difflib.get_close_matches(key, candidates, n=limit, cutoff=FUZZY_CUTOFF):
+            matches.extend(self.lookup(match + (f", {country}" if country else "")))
+        return matches[:limit]
+
+    def resolve(self, query):
+        """Return the City for query, or None if it is not uniquely known.
+
+        A name shared by several cities (e.g. "Springfield") only resolves
+        with a country; otherwise the API is left to pick as before.
+        """
+        matches = self.lookup(query)
+        return matches[0] if len(matches) == 1 else None
+
+    def check(self, query):
+        """Resolve query before it is sent to the API.
+
+        Returns the City when the name is unambiguous and None when the
+        index cannot tell: it is empty, the name is ambiguous, or the name
+        is unknown but close to nothing in it (e.g. "Portland, OR, US" or a
+        place missing from the list), so the API gets the name as typed.
+        Raises UnknownCity when the name is unknown but looks like a typo of
+        the suggested cities.
+        """
+        matches = self.lookup(query)
+        if not matches:
+            suggestions = self.correct(query) if self._keys else []
+            if suggestions:
+                raise UnknownCity(query, suggestions)
+            return None
+        return matches[0] if len(matches) == 1 else None
+
+
+# Shared index, loaded on first use
+city_index = CityIndex()
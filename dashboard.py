@@ -0,0 +1,304 @@
+"""Multi-city dashboard: a grid of tiles that update as their data arrives.
+
+All tiles are refreshed together through weather_batch.iter_weather, so
+cities with a known ID cost one /group request per GROUP_LIMIT cities and
+the rest are looked up concurrently, all behind one shared rate limiter.
+Results are streamed back to the Tk thread and each tile is updated on its
+own as soon as its city comes in; a tile whose data did not change is left
+alone. Opening the dashboard or adding a city serves cities still fresh in
+the weather cache without a request; the Refresh button and scheduled
+refreshes fetch every city again.
+
+The list of monitored cities is kept in the weather store.
+"""
+import json
+import os
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+from dotenv import load_dotenv
+
+from fetch_executor import FetchExecutor
+from icon_cache import get_icon, FORECAST_ICON_SIZE
+from rate_limit import RateLimiter
+from refresh_scheduler import RefreshScheduler
+from weather_batch import iter_weather
+from weather_cache import normalize_city
+from weather_logging import get_logger
+from weather_store import store
+from weather_view import format_temp
+
+load_dotenv()
+
+log = get_logger(__name__)
+
+# Sustained OpenWeatherMap requests per second for a dashboard refresh
+DASHBOARD_RATE = float(os.getenv("WEATHER_DASHBOARD_RATE", "1"))
+DASHBOARD_BURST = 5
+
+# Lookups in flight at once during a refresh
+DASHBOARD_CONCURRENCY = 8
+
+TILE_WIDTH = 200
+TILE_HEIGHT = 120
+TILE_GAP = 8
+
+# Store meta key holding the monitored cities as a JSON list
+CITIES_KEY = "dashboard_cities"
+
+
+def load_cities():
+    """Return the monitored cities saved by the last dashboard session"""
+    saved = store.get_meta(CITIES_KEY)
+    if saved:
+        try:
+            return json.loads(saved)
+        except ValueError:
+            log.warning("Ignoring unreadable dashboard city list")
+    last = store.last_city()
+    return [last] if last else []
+
+
+def save_cities(cities):
+    store.set_meta(CITIES_KEY, json.dumps(cities))
+
+
+class _Tile:
+    """One city's tile; its labels are only touched when its data changes"""
+
+    def __init__(self, parent, city, on_remove):
+        self.city = city
+        self.data = None
+        self.failed = False
+
+        self.frame = tk.Frame(parent, bd=1, relief='groove', padx=8, pady=6,
+                              width=TILE_WIDTH, height=TILE_HEIGHT)
+        self.frame.pack_propagate(False)
+        self.header = tk.Frame(self.frame)
+        self.header.pack(fill=tk.X)
+        self.name = tk.Label(self.header, text=city, font=("Helvetica", 11, "bold"), anchor='w')
+        self.name.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.remove = tk.Button(self.header, text="✕", bd=0, font=("Helvetica", 8),
+                                command=lambda: on_remove(city))
+        self.remove.pack(side=tk.RIGHT)
+
+        self.body = tk.Frame(self.frame)
+        self.body.pack(fill=tk.X)
+        self.icon = tk.Label(self.body)
+        self.icon.pack(side=tk.LEFT)
+        self.temp = tk.Label(self.body, font=("Helvetica", 20, "bold"))
+        self.temp.pack(side=tk.LEFT, padx=(5, 0))
+        self.desc = tk.Label(self.frame, font=("Helvetica", 9), anchor='w')
+        self.desc.pack(fill=tk.X)
+        self.status = tk.Label(self.frame, text="Loading...",
+                               font=("Helvetica", 8, "italic"), anchor='w')
+        self.status.pack(fill=tk.X, side=tk.BOTTOM)
+
+    def show(self, data, use_celsius):
+        if self.failed:
+            self.failed = False
+            self._color_status()
+        if data == self.data:
+            return
+        self.data = data
+        self.name.config(text=data.name or self.city)
+        photo = get_icon(data.icon, FORECAST_ICON_SIZE)
+        self.icon.config(image=photo if photo is not None else '')
+        self.desc.config(text=data.description.title())
+        self.apply_units(use_celsius)
+        observed = data.observed_at
+        self.status.config(
+            text=f"Observed {datetime.fromtimestamp(observed):%H:%M}" if observed else "")
+
+    def show_error(self, error):
+        # Keep the last good data on screen and flag it
+        self.failed = True
+        self.status.config(text=f"Update failed: {error}")
+        self._color_status()
+
+    def apply_units(self, use_celsius):
+        if self.data is not None:
+            self.temp.config(text=format_temp(self.data.temp, use_celsius))
+
+    def apply_theme(self, colors):
+        self.colors = colors
+        bg = colors['card_bg']
+        for widget in (self.frame, self.header, self.body, self.icon):
+            widget.config(bg=bg)
+        self.name.config(bg=bg, fg=colors['text_primary'])
+        self.remove.config(bg=bg, fg=colors['text_secondary'],
+                           activebackground=bg, activeforeground=colors['error'])
+        self.temp.config(bg=bg, fg=colors['primary'])
+        self.desc.config(bg=bg, fg=colors['text_secondary'])
+        self._color_status()
+
+    def _color_status(self):
+        self.status.config(bg=self.colors['card_bg'],
+                           fg=self.colors['error' if self.failed else 'text_secondary'])
+
+
+class Dashboard:
+    """Toplevel window with one tile per monitored city"""
+
+    def __init__(self, root, colors, use_celsius=True, limiter=None):
+        self.colors = colors
+        self.use_celsius = use_celsius
+        self.limiter = limiter or RateLimiter(DASHBOARD_RATE, DASHBOARD_BURST)
+        self.tiles = {}
+        self._columns = 0
+        self._updated = 0
+        self._errors = 0
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Weather Dashboard")
+        self.window.geometry("1100x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Header: add a city, refresh, and a one-line status
+        self.header = tk.Frame(self.window, padx=15, pady=10)
+        self.header.pack(fill=tk.X)
+        self.entry = tk.Entry(self.header, font=("Helvetica", 12), width=25)
+        self.entry.pack(side=tk.LEFT, ipady=4)
+        self.entry.bind("<Return>", lambda event: self.add_city(self.entry.get()))
+        self.add_btn = tk.Button(self.header, text="Add City", padx=10, bd=0,
+                                 command=lambda: self.add_city(self.entry.get()))
+        self.add_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.refresh_btn = tk.Button(self.header, text="⟳ Refresh", padx=10, bd=0,
+                                     command=self.refresh)
+        self.refresh_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.status = tk.Label(self.header, font=("Helvetica", 10), anchor='e')
+        self.status.pack(side=tk.RIGHT, fill=tk.X, expand=True)
+
+        # Scrolling grid of tiles
+        self.body = tk.Frame(self.window)
+        self.body.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(self.body, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self.body, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tile_grid = tk.Frame(self.canvas, padx=15)
+        self.canvas.create_window((0, 0), window=self.tile_grid, anchor='nw')
+        self.tile_grid.bind("<Configure>", lambda event: self.canvas.configure(
+            scrollregion=self.canvas.bbox("all")))
+        self.canvas.bind("<Configure>", lambda event: self._relayout())
+        self.canvas.bind("<MouseWheel>", lambda event: self.canvas.yview_scroll(
+            -1 if event.delta > 0 else 1, "units"))
+
+        self.fetcher = FetchExecutor(self.window, max_workers=1)
+        self.scheduler = RefreshScheduler(self.window, self.refresh)
+
+        for city in load_cities():
+            self._add_tile(city)
+        self.apply_theme(colors)
+        self._relayout(force=True)
+        self.refresh(use_cache=True)
+
+    def add_city(self, city):
+        city = city.strip()
+        if not city or normalize_city(city) in self.tiles:
+            return
+        self.entry.delete(0, tk.END)
+        self._add_tile(city)
+        self._relayout(force=True)
+        save_cities([tile.city for tile in self.tiles.values()])
+        # Cached cities come straight back, so this only fetches the new one
+        self.refresh(use_cache=True)
+
+    def remove_city(self, city):
+        tile = self.tiles.pop(normalize_city(city), None)
+        if tile is not None:
+            tile.frame.destroy()
+            self._relayout(force=True)
+            save_cities([tile.city for tile in self.tiles.values()])
+
+    def refresh(self, use_cache=False):
+        """Re-fetch every tile; each one updates as its city comes in.
+
+        use_cache=True serves cities still in the weather cache instead.
+        """
+        cities = [tile.city for tile in self.tiles.values()]
+        if not cities:
+            self.status.config(text="Add a city to start monitoring")
+            return
+        self._updated = self._errors = 0
+        self.status.config(text=f"Updating {len(cities)} cities...")
+        self.fetcher.submit_stream(
+            lambda: iter_weather(cities, DASHBOARD_CONCURRENCY, self.limiter, use_cache),
+            self._on_result,
+            self._on_refreshed
+        )
+
+    def apply_units(self, use_celsius):
+        self.use_celsius = use_celsius
+        for tile in self.tiles.values():
+            tile.apply_units(use_celsius)
+
+    def apply_theme(self, colors):
+        self.colors = colors
+        for widget in (self.window, self.header, self.body, self.canvas, self.tile_grid):
+            widget.config(bg=colors['background'])
+        self.entry.config(bg=colors['surface'], fg=colors['text_primary'],
+                          insertbackground=colors['text_primary'])
+        for btn in (self.add_btn, self.refresh_btn):
+            btn.config(bg=colors['primary'], fg=colors['button_text'],
+                       activebackground=colors['primary_dark'],
+                       activeforeground=colors['button_text'])
+        self.status.config(bg=colors['background'], fg=colors['text_secondary'])
+        for tile in self.tiles.values():
+            tile.apply_theme(colors)
+
+    def exists(self):
+        return bool(self.window.winfo_exists())
+
+    def close(self):
+        self.scheduler.stop()
+        self.fetcher.shutdown()
+        self.window.destroy()
+
+    def _add_tile(self, city):
+        tile = _Tile(self.tile_grid, city, self.remove_city)
+        tile.apply_theme(self.colors)
+        self.tiles[normalize_city(city)] = tile
+
+    def _relayout(self, force=False):
+        """Grid the tiles in as many columns as fit the window"""
+        width = max(self.canvas.winfo_width(), TILE_WIDTH)
+        columns = max(1, (width - 30) // (TILE_WIDTH + TILE_GAP))
+        if columns == self._columns and not force:
+            return
+        self._columns = columns
+        for i, tile in enumerate(self.tiles.values()):
+            tile.frame.grid(row=i // columns, column=i % columns,
+                            padx=(0, TILE_GAP), pady=(0, TILE_GAP))
+
+    def _on_result(self, item):
+        city, data, error = item
+        tile = self.tiles.get(normalize_city(city))
+        if tile is None:
+            # Removed while the refresh was running
+            return
+        if error is not None:
+            self._errors += 1
+            tile.show_error(error)
+        else:
+            self._updated += 1
+            tile.show(data, self.use_celsius)
+        self.status.config(text=f"Updating... {self._updated + self._errors}/{len(self.tiles)}")
+
+    def _on_refreshed(self, error):
+        if error is not None:
+            log.error("Dashboard refresh failed: %s", error)
+        summary = f"{self._updated} of {len(self.tiles)} cities updated at {datetime.now():%H:%M}"
+        if self._errors:
+            summary += f", {self._errors} failed"
+        self.status.config(text=summary)
+
+        if error is not None or (self._errors and not self._updated):
+            self.scheduler.failed()
+            return
+        # Next refresh after the newest observation is superseded
+        observed = [tile.data.observed_at for tile in self.tiles.values()
+                    if tile.data and tile.data.observed_at]
+        self.scheduler.start(max(observed) if observed else None)
@@ -1,5 +1,14 @@
+import json
 import os
-import requests
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+import http_client
+
+load_dotenv()
 
 # All known weather icon codes from OpenWeatherMap
 icon_codes = [
@@ -10,24 +19,104 @@ icon_codes = [
 
 # Destination folder for icons
 icon_folder = "icons"
-os.makedirs(icon_folder, exist_ok=True)
 
-# Icon base URL
-base_url = "https://openweathermap.org/img/wn/{}@2x.png"
+# ETag / Last-Modified of each downloaded icon, for conditional requests
+validators_path = os.path.join(icon_folder, "validators.json")
+
+# Icon base URL ({} is the icon code); overridable to point at a mock server
+base_url = os.getenv("OWM_ICON_URL", "https://openweathermap.org/img/wn/{}@2x.png")
 
-print("Downloading weather icons...")
+# Parallel downloads (kept within http_client.POOL_SIZE so connections are reused)
+MAX_WORKERS = 6
+
+
+def load_validators():
+    try:
+        with open(validators_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
 
-for code in icon_codes:
+
+def write_atomic(path, data, mode="wb"):
+    """Write to a temporary file next to path, then swap it in"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def fetch_icon(code, validator):
+    """Download one icon, skipping it if the server says it is unchanged.
+
+    Returns (status, new_validator) where status is "downloaded" or
+    "unchanged".
+    """
     url = base_url.format(code)
     dest_path = os.path.join(icon_folder, f"{code}.png")
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise error for non-200
-        with open(dest_path, "wb") as f:
-            f.write(response.content)
-        print(f" Downloaded: {code}")
-    except Exception as e:
-        print(f" Failed to download {code}: {e}")
-
-print("\n All icons processed.")
+    headers = {}
+    if validator and os.path.exists(dest_path):
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+
+    # Retries with backoff and connection reuse come from the shared client
+    response = http_client.get(url, headers=headers)
+
+    if response.status_code == 304:
+        return "unchanged", validator
+    response.raise_for_status()  # Raise error for non-200
+
+    write_atomic(dest_path, response.content)
+    new_validator = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return "downloaded", new_validator
+
+
+def download_icons():
+    os.makedirs(icon_folder, exist_ok=True)
+    validators = load_validators()
+
+    print("Downloading weather icons...")
+    started = time.perf_counter()
+
+    def timed_fetch(code):
+        icon_started = time.perf_counter()
+        try:
+            result = fetch_icon(code, validators.get(code))
+        except Exception as e:
+            result = e
+        return code, result, time.perf_counter() - icon_started
+
+    counts = {"downloaded": 0, "unchanged": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for code, result, elapsed in pool.map(timed_fetch, icon_codes):
+            if isinstance(result, Exception):
+                counts["failed"] += 1
+                print(f" Failed to download {code}: {result}")
+                continue
+            status, validator = result
+            counts[status] += 1
+            validators[code] = validator
+            print(f" {status.title()}: {code} ({elapsed * 1000:.0f} ms)")
+
+    write_atomic(validators_path, json.dumps(validators, indent=2), mode="w")
+
+    print(f"\n All icons processed in {time.perf_counter() - started:.2f}s: "
+          f"{counts['downloaded']} downloaded, {counts['unchanged']} unchanged, "
+          f"{counts['failed']} failed.")
+
+if __name__ == "__main__":
+    download_icons()
+
+    # Pack the icons for the GUI
+    from build_icon_atlas import build_atlas
+    build_atlas()
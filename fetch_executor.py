@@ -0,0 +1,141 @@
+"""Background fetch layer for the GUI.
+
+Network calls run on a small thread pool so the Tk main loop never blocks.
+Tk widgets must only be touched from the main thread, so finished results
+are put on a queue that the main thread drains with root.after().
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from weather_logging import get_logger
+
+log = get_logger(__name__)
+
+
+class FetchExecutor:
+    """Run groups of jobs concurrently and hand their results back to Tk"""
+
+    def __init__(self, root, max_workers=4, poll_interval=50):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="weather-fetch")
+        self._results = queue.Queue()
+        self._generation = 0
+        self._pending = []
+        self._polling = False
+
+    def submit(self, jobs, on_done):
+        """Run every callable in jobs at once and call on_done(results, errors)
+        on the Tk thread when all of them have finished.
+
+        jobs maps a name to a zero-argument callable. results maps each name to
+        the value it returned and errors maps it to the exception it raised.
+        Submitting again supersedes the previous request: jobs that have not
+        started yet are cancelled and late results are dropped.
+        """
+        self.cancel()
+        generation = self._generation
+        results, errors = {}, {}
+        lock = threading.Lock()
+        remaining = [len(jobs)]
+
+        def job_done(name, future):
+            if future.cancelled():
+                return
+            try:
+                value = future.result()
+            except Exception as err:
+                with lock:
+                    errors[name] = err
+            else:
+                with lock:
+                    results[name] = value
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self._results.put((generation, on_done, (results, errors), True))
+
+        if not jobs:
+            self._results.put((generation, on_done, (results, errors), True))
+        for name, job in jobs.items():
+            future = self._pool.submit(job)
+            self._pending.append(future)
+            future.add_done_callback(lambda f, name=name: job_done(name, f))
+        self._start_polling()
+
+    def submit_stream(self, produce, on_item, on_done=None):
+        """Run produce() on a worker and hand each item it yields to
+        on_item(item) on the Tk thread as soon as it is ready.
+
+        on_done(error) is called on the Tk thread afterwards, with the
+        exception produce() raised or None. Like submit(), this supersedes
+        the previous request; a superseded generator is closed at its next
+        item instead of running to the end.
+        """
+        self.cancel()
+        generation = self._generation
+
+        def run():
+            error = None
+            try:
+                items = produce()
+                try:
+                    for item in items:
+                        if generation != self._generation:
+                            break
+                        self._results.put((generation, on_item, (item,), False))
+                finally:
+                    close = getattr(items, "close", None)
+                    if close is not None:
+                        close()
+            except Exception as err:
+                error = err
+            self._results.put((generation, on_done or (lambda error: None), (error,), True))
+
+        self._pending.append(self._pool.submit(run))
+        self._start_polling()
+
+    def cancel(self):
+        """Drop the request in flight, if any"""
+        self._generation += 1
+        for future in self._pending:
+            future.cancel()
+        self._pending = []
+
+    def busy(self):
+        """Return True while a request is still waiting for results"""
+        return bool(self._pending)
+
+    def shutdown(self):
+        """Stop accepting work and abandon anything still queued"""
+        self.cancel()
+        self._pool.shutdown(wait=False)
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                generation, callback, args, final = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                # Superseded by a newer search
+                continue
+            if final:
+                self._pending = []
+            try:
+                callback(*args)
+            except Exception:
+                log.exception("Error in fetch callback")
+
+        if self._pending:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
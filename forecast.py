@@ -0,0 +1,129 @@
+"""Aggregate the 3-hourly OpenWeatherMap forecast into hourly and daily views.
+
+The forecast list is processed in a single pass. Slots are bucketed into
+local calendar days using the epoch "dt" field plus the city's UTC offset,
+so no date strings are parsed. Per-day statistics are kept in compact
+array-module columns rather than a dict per slot or per day; records()
+turns the days into compact ForecastDay records for display and caching.
+"""
+from array import array
+from datetime import datetime, timezone
+
+from weather_records import ForecastDay
+
+SECONDS_PER_DAY = 86400
+
+
+class HourlyForecast:
+    """Column-oriented 3-hourly slots"""
+
+    __slots__ = ("times", "temps", "precipitation", "icons", "descriptions")
+
+    def __init__(self):
+        self.times = array("q")          # epoch seconds (UTC)
+        self.temps = array("d")          # °C
+        self.precipitation = array("d")  # mm of rain + snow in the slot
+        self.icons = []
+        self.descriptions = []
+
+    def __len__(self):
+        return len(self.times)
+
+
+class DailyForecast:
+    """Column-oriented per-day aggregates"""
+
+    __slots__ = ("days", "temp_min", "temp_max", "temp_mean",
+                 "precipitation", "icons", "descriptions")
+
+    def __init__(self):
+        self.days = array("l")           # local days since the epoch
+        self.temp_min = array("d")
+        self.temp_max = array("d")
+        self.temp_mean = array("d")
+        self.precipitation = array("d")
+        self.icons = []
+        self.descriptions = []
+
+    def __len__(self):
+        return len(self.days)
+
+    def label(self, i):
+        """Display label of day i, e.g. "Mon, 14 Oct" """
+        date = datetime.fromtimestamp(self.days[i] * SECONDS_PER_DAY, timezone.utc)
+        return date.strftime("%a, %d %b")
+
+    def records(self, limit=None):
+        """The first limit days as ForecastDay records"""
+        return [
+            ForecastDay(self.label(i), self.temp_min[i], self.temp_max[i], self.temp_mean[i],
+                        self.precipitation[i], self.icons[i], self.descriptions[i])
+            for i in range(len(self.days) if limit is None else min(limit, len(self.days)))
+        ]
+
+
+def aggregate(payload):
+    """Return (HourlyForecast, DailyForecast) for a /forecast response"""
+    offset = payload.get("city", {}).get("timezone", 0)
+    hourly = HourlyForecast()
+    daily = DailyForecast()
+
+    current_day = None
+    day_min = day_max = day_sum = day_precip = 0.0
+    day_count = 0
+    icon_counts = {}
+    icon_descriptions = {}
+
+    def close_day():
+        # Dominant icon: most frequent in the day, earliest wins a tie
+        icon = max(icon_counts, key=icon_counts.get)
+        daily.days.append(current_day)
+        daily.temp_min.append(day_min)
+        daily.temp_max.append(day_max)
+        daily.temp_mean.append(day_sum / day_count)
+        daily.precipitation.append(day_precip)
+        daily.icons.append(icon)
+        daily.descriptions.append(icon_descriptions[icon])
+
+    for entry in payload.get("list", []):
+        dt = entry.get("dt")
+        temp = entry.get("main", {}).get("temp")
+        if dt is None or temp is None:
+            continue
+        weather = (entry.get("weather") or [{}])[0]
+        icon = weather.get("icon", "02d")
+        description = weather.get("description", "N/A")
+        precip = (entry.get("rain", {}).get("3h", 0.0)
+                  + entry.get("snow", {}).get("3h", 0.0))
+
+        hourly.times.append(dt)
+        hourly.temps.append(temp)
+        hourly.precipitation.append(precip)
+        hourly.icons.append(icon)
+        hourly.descriptions.append(description)
+
+        day = (dt + offset) // SECONDS_PER_DAY
+        if day != current_day:
+            if current_day is not None:
+                close_day()
+            current_day = day
+            day_min = day_max = day_sum = temp
+            day_precip = precip
+            day_count = 1
+            icon_counts = {icon: 1}
+            icon_descriptions = {icon: description}
+            continue
+
+        if temp < day_min:
+            day_min = temp
+        elif temp > day_max:
+            day_max = temp
+        day_sum += temp
+        day_precip += precip
+        day_count += 1
+        icon_counts[icon] = icon_counts.get(icon, 0) + 1
+        icon_descriptions.setdefault(icon, description)
+
+    if current_day is not None:
+        close_day()
+    return hourly, daily
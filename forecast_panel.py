@@ -0,0 +1,176 @@
+"""Scrolling row of forecast cards that is built once and reused.
+
+The panel keeps a small pool of card widgets, just enough to fill the
+visible part of its canvas. Showing a new forecast, scrolling, switching
+units or switching themes re-fills or re-colours those cards in place, so
+the number of widgets stays the same however many days are shown and
+however many searches are made in a session.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from icon_cache import get_icon, FORECAST_ICON_SIZE
+from weather_view import format_temp
+
+# Shown when an icon is not available
+FALLBACK_ICON = "☀️"
+
+
+class _Card:
+    """One forecast card; its labels are re-filled, never rebuilt"""
+
+    def __init__(self, canvas, width, height):
+        self.frame = tk.Frame(canvas, bd=1, relief='groove', padx=5, pady=5)
+        self.day_name = tk.Label(self.frame, font=("Helvetica", 8, "bold"), justify='center')
+        self.day_num = tk.Label(self.frame, font=("Helvetica", 16, "bold"), justify='center')
+        self.month = tk.Label(self.frame, font=("Helvetica", 8), justify='center')
+        self.icon = tk.Label(self.frame, font=("Arial", 16))
+        self.temp = tk.Label(self.frame)
+        self.desc = tk.Label(self.frame, font=("Helvetica", 7),
+                             wraplength=width - 10, justify='center')
+        self.day_name.pack(fill=tk.X)
+        self.day_num.pack(fill=tk.X)
+        self.month.pack(fill=tk.X, pady=(0, 2))
+        self.icon.pack()
+        self.temp.pack()
+        self.desc.pack()
+        self.window = canvas.create_window(0, 2, window=self.frame, anchor='nw',
+                                           width=width, height=height)
+        # What the labels currently show, to skip redundant re-fills
+        self._item = None
+        self._use_celsius = None
+
+    def fill(self, item, use_celsius):
+        if item is self._item and use_celsius == self._use_celsius:
+            return
+        self._item = item
+        self._use_celsius = use_celsius
+
+        # "Mon, 14 Oct" -> MON / 14 / OCT
+        day_name, _, rest = item.date.partition(',')
+        day_num, _, month = rest.strip().partition(' ')
+        self.day_name.config(text=day_name.strip().upper())
+        self.day_num.config(text=day_num)
+        self.month.config(text=month.upper())
+
+        photo = get_icon(item.icon, FORECAST_ICON_SIZE)
+        if photo is not None:
+            self.icon.config(image=photo, text='')
+        else:
+            self.icon.config(image='', text=FALLBACK_ICON)
+
+        # Daily high / low
+        self.temp.config(font=("Helvetica", 9, "bold"), text="{} / {}".format(
+            format_temp(item.temp_max, use_celsius, 0),
+            format_temp(item.temp_min, use_celsius, 0)))
+        self.desc.config(text=item.description.title())
+
+    def apply_theme(self, colors):
+        bg = colors['card_bg']
+        self.frame.config(bg=bg)
+        self.icon.config(bg=bg)
+        self.day_name.config(bg=bg, fg=colors['primary'])
+        for label in (self.day_num, self.temp):
+            label.config(bg=bg, fg=colors['text_primary'])
+        for label in (self.month, self.desc):
+            label.config(bg=bg, fg=colors['text_secondary'])
+
+
+class ForecastPanel:
+    """Titled, horizontally scrolling forecast row.
+
+    Only the cards in view exist as widgets: scrolling moves the same cards
+    along the canvas and re-fills them with the items now in view.
+    """
+
+    def __init__(self, parent, colors, use_celsius=True, title="5-DAY FORECAST",
+                 card_width=100, card_height=140, padding=5):
+        self.colors = colors
+        self.use_celsius = use_celsius
+        self.card_width = card_width
+        self.card_height = card_height
+        self.padding = padding
+        self.items = []
+        self._stride = card_width + padding
+        self._cards = []
+
+        self.frame = tk.Frame(parent, bd=0, relief=tk.FLAT, padx=5, pady=0, height=180)
+        self.frame.pack_propagate(False)
+
+        # Title with subtle underline
+        self._title_frame = tk.Frame(self.frame)
+        self._title_frame.pack(fill=tk.X, pady=(0, 5))
+        self._title = tk.Label(self._title_frame, text=title,
+                               font=("Helvetica", 9, "bold"), anchor='center')
+        self._title.pack(fill=tk.X)
+        self._separator = tk.Frame(self._title_frame, height=1)
+        self._separator.pack(side=tk.BOTTOM, fill=tk.X, pady=(3, 0))
+
+        self._canvas_container = tk.Frame(self.frame, height=card_height + 10)
+        self._canvas_container.pack(fill=tk.BOTH, expand=True)
+        self._canvas_container.pack_propagate(False)
+        self.canvas = tk.Canvas(self._canvas_container, highlightthickness=0,
+                                height=card_height + 10, xscrollincrement=self._stride)
+        self._scrollbar = ttk.Scrollbar(self._canvas_container, orient=tk.HORIZONTAL,
+                                        command=self.canvas.xview)
+        self.canvas.configure(xscrollcommand=self._on_scroll)
+        self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda event: self._layout())
+        self.canvas.bind("<Shift-MouseWheel>", lambda event: self.canvas.xview_scroll(
+            -1 if event.delta > 0 else 1, "units"))
+
+        self.apply_theme(colors)
+
+    def show(self, items):
+        """Display items (ForecastDay records), scrolled to the start"""
+        self.items = list(items)
+        width = max(0, len(self.items) * self._stride - self.padding)
+        self.canvas.config(scrollregion=(0, 0, width, self.card_height))
+        self.canvas.xview_moveto(0)
+        self._layout()
+
+    def apply_theme(self, colors):
+        """Re-colour the panel and every card"""
+        self.colors = colors
+        for widget in (self.frame, self._title_frame, self._canvas_container, self.canvas):
+            widget.config(bg=colors['background'])
+        self._title.config(bg=colors['background'], fg=colors['primary_dark'])
+        self._separator.config(bg=colors['primary_light'])
+        for card in self._cards:
+            card.apply_theme(colors)
+
+    def apply_units(self, use_celsius):
+        """Re-format the temperatures on the cards in view"""
+        self.use_celsius = use_celsius
+        self._layout()
+
+    def _on_scroll(self, first, last):
+        self._scrollbar.set(first, last)
+        # Only show the scrollbar when there is something to scroll to
+        if float(first) > 0 or float(last) < 1:
+            if not self._scrollbar.winfo_manager():
+                self._scrollbar.pack(fill=tk.X, pady=(0, 5))
+        elif self._scrollbar.winfo_manager():
+            self._scrollbar.pack_forget()
+        self._layout()
+
+    def _layout(self):
+        """Point the card pool at the items currently in view"""
+        view_width = max(self.canvas.winfo_width(), self.canvas.winfo_reqwidth())
+        left = max(0, int(self.canvas.canvasx(0)))
+        first = left // self._stride
+        last = min(len(self.items), (left + view_width) // self._stride + 1)
+
+        while len(self._cards) < last - first:
+            card = _Card(self.canvas, self.card_width, self.card_height)
+            card.apply_theme(self.colors)
+            self._cards.append(card)
+
+        for offset, card in enumerate(self._cards):
+            index = first + offset
+            if index < last:
+                card.fill(self.items[index], self.use_celsius)
+                self.canvas.coords(card.window, index * self._stride, 2)
+                self.canvas.itemconfigure(card.window, state=tk.NORMAL)
+            else:
+                self.canvas.itemconfigure(card.window, state=tk.HIDDEN)
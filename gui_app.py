@@ -1,22 +1,46 @@
+import time
+
+# Start of the startup clock, for WEATHER_EXIT_AFTER_PAINT
+STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import *
 from tkinter import ttk, messagebox
 from tkinter.constants import *
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
 import os
+import threading
 from dotenv import load_dotenv
-import geocoder
 from datetime import datetime
+import http_client
+import owm_client
+import tracing
+from fetch_executor import FetchExecutor
+from weather_cache import weather_cache, forecast_cache
+from weather_store import store
+from weather_view import WeatherViewModel
+from location import locate, cached_city
+from city_index import city_index, city_label as label_for_city, UnknownCity
+from weather_core import weather_client, describe_error, WeatherResult, ForecastResult, CACHE, SAVED
+from weather_logging import get_logger
+import icon_cache
+from forecast_panel import ForecastPanel
+from refresh_scheduler import RefreshScheduler
+from dashboard import Dashboard
+from icon_cache import get_icon, warm_icons, CURRENT_ICON_SIZE
 
-# Load API keys from .env
 load_dotenv()
-WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
-IPGEOLOCATION_API_KEY = os.getenv("IPGEOLOCATION_API_KEY")
 
-# Initialize IPGeolocation API
-ipgeo = None
+# Decode all weather icons in the background once the window is up
+WARM_ICONS = os.getenv("WEATHER_WARM_ICONS", "1") != "0"
+
+# Milliseconds between updates of the API usage readout
+USAGE_REFRESH_MS = 5000
+
+# Print the time to first paint and exit (used by benchmarks/bench_startup.py)
+EXIT_AFTER_PAINT = os.getenv("WEATHER_EXIT_AFTER_PAINT") == "1"
+
+# Named explicitly: this module usually runs as __main__
+log = get_logger("gui_app")
 
 # Unit state (True for Celsius, False for Fahrenheit)
 use_celsius = True
@@ -24,6 +48,9 @@ use_celsius = True
 # Theme state (True for light, False for dark)
 light_theme = True
 
+# Multi-city dashboard window, once opened
+dashboard = None
+
 # Color schemes for light and dark themes
 THEMES = {
     'light': {
@@ -71,20 +98,19 @@ THEMES = {
 # Current theme colors
 COLORS = THEMES['light'].copy()
 
+# Last displayed weather and the widgets showing it
+view = WeatherViewModel(COLORS, use_celsius)
+
 def toggle_units():
     """Toggle between Celsius and Fahrenheit"""
     global use_celsius
     use_celsius = not use_celsius
     unit_toggle_btn.config(text="🌡️ °F" if use_celsius else "🌡️ °C")
-    if city_entry.get().strip():
-        show_weather()
-
-def convert_temp(temp_c):
-    """Convert temperature between Celsius and Fahrenheit"""
-    if use_celsius:
-        return temp_c, "°C"
-    else:
-        return (temp_c * 9/5) + 32, "°F"
+    # Re-format the temperatures already on screen; no refetch or rebuild
+    view.apply_units(use_celsius)
+    forecast_panel.apply_units(use_celsius)
+    if dashboard is not None and dashboard.exists():
+        dashboard.apply_units(use_celsius)
 
 def toggle_theme():
     """Toggle between light and dark themes"""
@@ -98,10 +124,6 @@ def toggle_theme():
     
     # Update all UI elements
     update_theme()
-    
-    # Refresh weather display to update colors
-    if city_entry.get().strip():
-        show_weather()
 
 def update_theme():
     """Update all UI elements with current theme colors"""
@@ -110,11 +132,14 @@ def update_theme():
     
     # Update main container and frames
     for frame in [main_frame, header_frame, title_frame, search_container, 
-                 city_frame, button_frame, weather_container]:
+                 city_frame, button_frame, weather_container, display_frame,
+                 current_area]:
         frame.config(bg=COLORS['background'])
     
     # Update title and labels
     app_title.config(bg=COLORS['background'], fg=COLORS['primary_dark'])
+    usage_label.config(bg=COLORS['background'], fg=COLORS['text_secondary'])
+    trace_overlay.config(bg=COLORS['surface'], fg=COLORS['text_secondary'])
     title_underline.config(bg=COLORS['primary_light'])
     city_label.config(bg=COLORS['background'], fg=COLORS['text_primary'])
     
@@ -124,11 +149,16 @@ def update_theme():
         fg=COLORS['text_primary'],
         insertbackground=COLORS['text_primary']
     )
+    suggestion_box.config(
+        bg=COLORS['surface'],
+        fg=COLORS['text_primary'],
+        selectbackground=COLORS['primary_light']
+    )
     
     # Update buttons
-    for btn in [search_btn, auto_detect_btn, unit_toggle_btn, theme_btn]:
+    for btn in [search_btn, auto_detect_btn, dashboard_btn, unit_toggle_btn, theme_btn]:
         btn.config(
-            bg=COLORS['primary_light'] if btn == unit_toggle_btn else COLORS['accent'] if btn == auto_detect_btn else COLORS['primary'],
+            bg=COLORS['primary_light'] if btn == unit_toggle_btn else COLORS['accent'] if btn in (auto_detect_btn, dashboard_btn) else COLORS['primary'],
             fg=COLORS['button_text'],
             activebackground=COLORS['primary_dark'],
             activeforeground=COLORS['button_text']
@@ -137,529 +167,334 @@ def update_theme():
     # Update theme button specifically
     theme_btn.config(bg=COLORS['toggle_bg'])
 
-# Fetch weather data
-def get_weather(city):
-    base_url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
-        "q": city,
-        "appid": WEATHER_API_KEY,
-        "units": "metric"
-    }
-
-    try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as http_err:
-        messagebox.showerror("Error", f"HTTP Error: {http_err}")
-    except Exception as err:
-        messagebox.showerror("Error", f"Error: {err}")
-    return None
-
-# Fetch forecast data
-def get_forecast(city):
+    # Re-colour the weather display in place
+    view.apply_theme(COLORS)
+    forecast_panel.apply_theme(COLORS)
+    if dashboard is not None and dashboard.exists():
+        dashboard.apply_theme(COLORS)
+
+# Fetch weather data as a WeatherResult (runs on a worker thread, so errors
+# are raised and reported by render_weather on the Tk thread). With
+# fallback, a failed fetch serves the last saved copy, flagged as stale.
+def get_weather(city, use_cache=True, fallback=True):
+    return weather_client.weather(city, use_cache, fallback)
+
+# Fetch forecast data as a ForecastResult; a failed forecast leaves the
+# current weather shown
+def get_forecast(city, use_cache=True, fallback=True):
     try:
-        api_key = WEATHER_API_KEY
-        url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&units=metric&appid={api_key}&cnt=40"  # Request 40 entries (5 days * 8 per day)
-        response = requests.get(url)
-        data = response.json()
-
-        if data.get("cod") != "200":
-            print("Forecast API error:", data.get("message", "Unknown error"))
-            return None
-
-        daily_forecast = []
-        seen_dates = set()
-        
-        print(f"Raw forecast data for {city}:", data) 
-
-        for entry in data.get("list", []):
-            try:
-                
-                dt_txt = entry.get("dt_txt", "")
-                if not dt_txt:
-                    continue
-                    
-                
-                dt = datetime.strptime(dt_txt, "%Y-%m-%d %H:%M:%S")
-                date_str = dt.strftime("%Y-%m-%d")  
-                
-            
-                if date_str in seen_dates:
-                    continue
-                    
-                
-                seen_dates.add(date_str)
-                daily_forecast.append({
-                    "date": dt.strftime("%a, %d %b"),  
-                    "temp": entry.get("main", {}).get("temp", "N/A"),
-                    "icon": entry.get("weather", [{}])[0].get("icon", "02d"),
-                    "weather": entry.get("weather", [{}])[0].get("description", "N/A")
-                })
-                
-                print(f"Added forecast for {date_str}:", daily_forecast[-1])  
-                
-                
-                if len(daily_forecast) >= 5:
-                    break
-                    
-            except Exception as e:
-                print(f"Error processing forecast entry: {e}")
-                continue
-
-        print('Processed forecast data:', daily_forecast)  
-        return daily_forecast
-
-    except Exception as e:
-        print(f"Error in get_forecast: {e}")
-        import traceback
-        traceback.print_exc()
+        return weather_client.forecast(city, use_cache, fallback)
+    except Exception:
+        log.exception("Error in get_forecast for %s", city)
         return None
 
-# display forecast
-def display_forecast_gui(forecast_data, parent_frame):
-    try:
-        print("Displaying forecast data:", forecast_data)  
-        
-        
-        for widget in parent_frame.winfo_children():
+def clear_weather_display():
+    """Remove the weather display and drop the view's widget bindings.
+
+    The display frame and forecast panel are kept for the next search.
+    """
+    for widget in weather_container.winfo_children():
+        if widget is not display_frame:
             widget.destroy()
-        
-        if not forecast_data or len(forecast_data) == 0:
-            print("No forecast data to display")
-            return
-        
-        # Main forecast container
-        forecast_container = Frame(parent_frame, 
-                                bg=COLORS['background'],
-                                bd=0,
-                                relief=FLAT,
-                                padx=5,
-                                pady=0)
-        forecast_container.pack(fill=BOTH, expand=True, pady=(0, 5))
-        forecast_container.pack_propagate(False)
-        forecast_container.config(height=180)  
-        
-        # Title with subtle underline
-        title_frame = Frame(forecast_container, bg=COLORS['background'])
-        title_frame.pack(fill=X, pady=(0, 5))
-        
-        title_label = Label(title_frame, 
-                          text="5-DAY FORECAST", 
-                          font=("Helvetica", 9, "bold"), 
-                          bg=COLORS['background'], 
-                          fg=COLORS['primary_dark'],
-                          anchor='center')
-        title_label.pack(fill=X)
-        
-        # Add subtle separator line under title
-        separator = Frame(title_frame, height=1, bg=COLORS['primary_light'])
-        separator.pack(side=BOTTOM, fill=X, pady=(3, 0))  
-        
-        # Create a frame for the days with horizontal scrolling
-        canvas_container = Frame(forecast_container, 
-                              bg=COLORS['background'],
-                              height=150)  
-        canvas_container.pack(fill=BOTH, expand=True)
-        canvas_container.pack_propagate(False)
-        
-        # Create canvas with horizontal scrollbar
-        canvas = Canvas(canvas_container, 
-                      bg=COLORS['background'],
-                      highlightthickness=0,
-                      height=150)  
-        
-        # Add horizontal scrollbar (only show if needed)
-        x_scrollbar = ttk.Scrollbar(canvas_container, 
-                                 orient=HORIZONTAL, 
-                                 command=canvas.xview)
-        
-        canvas.configure(xscrollcommand=x_scrollbar.set)
-        
-        # Pack the canvas and scrollbar
-        canvas.pack(side=TOP, fill=BOTH, expand=True)
-        
-        # Create a frame inside the canvas to hold the days
-        days_container = Frame(canvas, bg=COLORS['background'])
-        
-        # Calculate required width for all day frames
-        day_width = 100  
-        padding = 5      
-        try:
-            total_width = (day_width * 5) + (padding * 4)  
-            print(f"DEBUG: day_width={day_width}, padding={padding}, total_width={total_width} (type: {type(total_width)})")
-        except Exception as e:
-            print(f"DEBUG ERROR calculating total_width: {e}")
-        # Create the window in the canvas for the days container
-        try:
-            canvas.create_window((0, 0), window=days_container, anchor='nw', width=total_width, height=150)
-        except Exception as e:
-            print(f"DEBUG ERROR in create_window: {e}")
-        
-        # Configure day frame style - more compact
-        day_style = {
-            'bg': COLORS['card_bg'],
-            'bd': 1,
-            'relief': 'groove',
-            'padx': 5,    
-            'pady': 5,    
-            'width': day_width,
-            'height': 130  
-        }
-
-        # Create day frames for each forecast day
-        for i, day in enumerate(forecast_data[:5]):  
-            try:
-                # Create day frame with subtle shadow effect
-                day_frame = Frame(days_container, **day_style)
-                day_frame.grid(row=0, column=i, padx=(0, padding) if i < 4 else 0, sticky='nsew', pady=2)
-                day_frame.grid_propagate(False)
-                
-                # Configure column weights for the days container
-                days_container.columnconfigure(i, weight=1)
-                
-                # Date with better formatting
-                date_parts = day['date'].split(',')
-                day_name = date_parts[0].strip()  
-                day_num = date_parts[1].strip().split()[0]  
-                month_name = date_parts[1].strip().split()[1]  
-                
-                # Create a frame for date with better styling
-                date_frame = Frame(day_frame, bg=COLORS['card_bg'], bd=0)
-                date_frame.pack(fill=X, pady=(0, 2))  
-                
-                # Day name 
-                Label(date_frame, 
-                     text=day_name.upper(), 
-                     font=("Helvetica", 8, "bold"),  
-                     bg=COLORS['card_bg'],
-                     fg=COLORS['primary'],
-                     justify='center').pack(fill=X)
-                
-                # Day number 
-                Label(date_frame, 
-                     text=day_num, 
-                     font=("Helvetica", 16, "bold"),  
-                     bg=COLORS['card_bg'],
-                     fg=COLORS['text_primary'],
-                     justify='center').pack(fill=X)
-                
-                # Month name 
-                Label(date_frame, 
-                     text=month_name.upper(), 
-                     font=("Helvetica", 8),  
-                     bg=COLORS['card_bg'],
-                     fg=COLORS['text_secondary'],
-                     justify='center').pack(fill=X, pady=(0, 2))  
-                
-                # Weather icon with better centering
-                icon_frame = Frame(day_frame, bg=COLORS['card_bg'])
-                icon_frame.pack(fill=X, pady=0)  
-                
-                icon_code = day.get('icon', '')
-                icon_path = os.path.join("icons", f"{icon_code}.png")
-                
-                try:
-                    if os.path.exists(icon_path):
-                        icon_image = Image.open(icon_path)
-                        icon_image = icon_image.resize((40, 40), Image.Resampling.LANCZOS)  
-                        icon_photo = ImageTk.PhotoImage(icon_image)
-                        icon_label = Label(icon_frame, image=icon_photo, bg=COLORS['card_bg'])
-                        icon_label.image = icon_photo  
-                        icon_label.pack()
-                    else:
-                        # Fallback to text emoji
-                        Label(icon_frame, 
-                             text="☀️", 
-                             font=("Arial", 16),
-                             bg=COLORS['card_bg']).pack()
-                except Exception as e:
-                    print(f"Error loading icon: {e}")
-                    # Fallback to text emoji
-                    Label(icon_frame, 
-                         text="☀️", 
-                         font=("Arial", 16), 
-                         bg=COLORS['card_bg']).pack()
-                
-                # Temperature
-                temp_frame = Frame(day_frame, bg=COLORS['card_bg'])
-                temp_frame.pack(fill=X, pady=(0, 0))  
-                
-                try:
-                    temp = day.get('temp', 0)
-                    if isinstance(temp, (int, float)):
-                        temp_str = f"{int(round(float(temp), 0))}°C"
-                    else:
-                        temp_str = f"{temp}°C"
-                    
-                    Label(temp_frame,
-                         text=temp_str,
-                         font=("Helvetica", 12, "bold"),  
-                         bg=COLORS['card_bg'],
-                         fg=COLORS['text_primary']).pack()
-                except Exception as e:
-                    print(f"Error displaying temperature: {e}")
-                
-                # Weather description
-                desc_frame = Frame(day_frame, bg=COLORS['card_bg'])
-                desc_frame.pack(fill=X, pady=(0, 0))  
-                
-                try:
-                    desc = day.get('weather', '').title()
-                    Label(desc_frame,
-                         text=desc,
-                         font=("Helvetica", 7),
-                         bg=COLORS['card_bg'],
-                         fg=COLORS['text_secondary'],
-                         wraplength=day_width-10,  
-                         justify='center').pack()
-                except Exception as e:
-                    print(f"Error displaying weather description: {e}")
-                
-            except Exception as e:
-                print(f"Error creating forecast day {i}: {e}")
-                continue
-        
-        # Update the canvas scroll region
-        canvas.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
-        
-        # Only show scrollbar if content is wider than canvas
-        if canvas.bbox("all")[2] > canvas.winfo_width():
-            x_scrollbar.pack(fill=X, pady=(0, 5))
-        
-    except Exception as e:
-        print(f"Error in display_forecast_gui: {e}")
-        import traceback
-        traceback.print_exc()
+    for widget in current_area.winfo_children():
+        widget.destroy()
+    display_frame.pack_forget()
+    view.clear()
 
 # Update UI
-def show_weather():
+def show_weather(revalidate=False):
+    """Look up the city in the search box and display it.
+
+    With revalidate=True the current display is left in place while fresh
+    data is fetched in the background.
+    """
+    hide_suggestions()
+    city = city_entry.get().strip()
+    if not city:
+        fetcher.cancel()
+        clear_weather_display()
+        messagebox.showinfo("Info", "Please enter a city or use the Auto Detect button")
+        return
+
+    # Catch typos locally instead of spending a request on a 404; names
+    # the index cannot place go to the API as typed
+    notice = None
     try:
-        # previous weather display
-        for widget in weather_container.winfo_children():
-            widget.destroy()
-            
-        city = city_entry.get().strip()
-        if not city:
-            messagebox.showinfo("Info", "Please enter a city or use the Auto Detect button")
+        city_index.check(city)
+    except UnknownCity as err:
+        city = label_for_city(err.suggestions[0])
+        city_entry.delete(0, tk.END)
+        city_entry.insert(0, city)
+        notice = f"No city called '{err.query}'; showing {city} instead"
+
+    # Timed from here until the result is on screen (when tracing is on)
+    search = tracing.begin("search", city=city)
+
+    data = forecast_data = None
+    if not revalidate:
+        # Searching again for a city still in both caches (e.g. the one on
+        # screen) skips the worker round trip entirely
+        data = weather_cache.get(city)
+        forecast_data = forecast_cache.get(city)
+        if data is not None and forecast_data is not None:
+            fetcher.cancel()
+            render_weather(city,
+                           {"weather": WeatherResult(city, data, CACHE),
+                            "forecast": ForecastResult(city, forecast_data, CACHE)},
+                           {}, search=search, notice=notice)
             return
 
-        # Get current weather data
-        data = get_weather(city)
-        if not data:
-            messagebox.showerror("Error", "Could not retrieve weather data")
+        # Loading state while both requests run in the background
+        clear_weather_display()
+        view.bind_colors(Label(weather_container,
+              text=f"Loading weather for {city}...",
+              font=("Helvetica", 14)), bg='background', fg='text_secondary').pack(pady=40)
+
+    # Fetch current weather and forecast concurrently; a newer search
+    # supersedes this one and its results are dropped
+    fetcher.submit(
+        {
+            "weather": (lambda: WeatherResult(city, data, CACHE)) if data is not None
+                       else (lambda: get_weather(city, use_cache=False)),
+            "forecast": (lambda: ForecastResult(city, forecast_data, CACHE))
+                        if forecast_data is not None
+                        else (lambda: get_forecast(city, use_cache=False)),
+        },
+        lambda results, errors: render_weather(city, results, errors, search=search,
+                                               notice=notice)
+    )
+
+def render_weather(city, results, errors, search=None, notice=None):
+    """Build the weather display from fetched results.
+
+    results holds a WeatherResult and a ForecastResult. Saved data (served
+    by weather_client after a failed lookup, or restored at start-up) gets
+    a banner so the user knows it may be out of date. notice, if given, is
+    shown as a banner too (e.g. a corrected city name). search is the
+    tracing operation started by show_weather, ended once the display has
+    been drawn.
+    """
+    try:
+        result = results.get("weather")
+        if result is None:
+            clear_weather_display()
+            err = errors.get("weather")
+            if err is not None:
+                messagebox.showerror("Error", describe_error(err))
+            else:
+                messagebox.showerror("Error", "Could not retrieve weather data")
             return
+        data = result.conditions
+        stale_since = result.fetched_at if result.stale else None
+        if stale_since is None:
+            store.set_last_city(city)
 
-        # Get forecast data
-        forecast_data = get_forecast(city)
+        forecast = results.get("forecast")
+        forecast_data = forecast.days if forecast is not None else None
         if not forecast_data:
-            print("Warning: Could not retrieve forecast data")
-        
-        # Convert temperatures
-        temp, temp_unit = convert_temp(data['main']['temp'])
-        feels_like, _ = convert_temp(data['main']['feels_like'])
-        temp_min, _ = convert_temp(data['main']['temp_min'])
-        temp_max, _ = convert_temp(data['main']['temp_max'])
-
-        # Main container with padding
-        main_container = Frame(weather_container, bg=COLORS['background'], padx=20, pady=20)
-        main_container.pack(fill=BOTH, expand=True)
-        
-        # Current weather section
-        current_weather_frame = Frame(main_container, 
-                                   bg=COLORS['surface'],
-                                   bd=2,
-                                   relief=GROOVE,
-                                   padx=20,
-                                   pady=20)
-        current_weather_frame.pack(fill=X, pady=(0, 20))
-        
-        # Top row with city and icon
-        top_row = Frame(current_weather_frame, bg=COLORS['surface'])
-        top_row.pack(fill=X, pady=(0, 15))
-        
-        # City and date
-        city_date_frame = Frame(top_row, bg=COLORS['surface'])
-        city_date_frame.pack(side=LEFT, fill=BOTH, expand=True)
-        
-        city_label = Label(city_date_frame, 
-                         text=f"{data['name']}", 
-                         font=("Helvetica", 24, "bold"), 
-                         bg=COLORS['surface'],
-                         fg=COLORS['text_primary'])
-        city_label.pack(anchor='w')
-
-        current_date = datetime.now().strftime("%A, %B %d, %Y")
-        date_label = Label(city_date_frame, 
-                         text=current_date,
-                         font=("Helvetica", 12),
-                         bg=COLORS['surface'],
-                         fg=COLORS['text_secondary'])
-        date_label.pack(anchor='w', pady=(0, 10))
-        
-        # Weather icon
-        icon_code = data["weather"][0]["icon"]
-        icon_path = os.path.join("icons", f"{icon_code}.png")
-        try:
-            if os.path.exists(icon_path):
-                icon_image = Image.open(icon_path)
-                icon_image = icon_image.resize((100, 100), Image.Resampling.LANCZOS)
-                icon_photo = ImageTk.PhotoImage(icon_image)
-                icon_label = Label(top_row, 
-                                 image=icon_photo, 
-                                 bg=COLORS['surface'])
-                icon_label.image = icon_photo  
-                icon_label.pack(side=RIGHT, padx=10)
-        except Exception as e:
-            print(f"Error loading weather icon: {e}")
-        
-        # Weather details
-        weather_desc = data["weather"][0]["description"].title()
-        desc_label = Label(city_date_frame, 
-                         text=weather_desc, 
-                         font=("Helvetica", 14),
-                         bg=COLORS['surface'],
-                         fg=COLORS['text_primary'])
-        desc_label.pack(anchor='w', pady=(0, 10))
-        
-        # Temperature display
-        temp_frame = Frame(city_date_frame, bg=COLORS['surface'])
-        temp_frame.pack(anchor='w')
-        
-        temp_label = Label(temp_frame, 
-                         text=f"{temp}°{temp_unit}", 
-                         font=("Helvetica", 48, "bold"),
-                         bg=COLORS['surface'],
-                         fg=COLORS['primary'])
-        temp_label.pack(side=LEFT)
-        
-        # Additional weather info
-        details_frame = Frame(city_date_frame, bg=COLORS['surface'])
-        details_frame.pack(fill=X, pady=(10, 0))
-        
-        # Feels like
-        feels_frame = Frame(details_frame, bg=COLORS['surface'])
-        feels_frame.pack(side=LEFT, padx=(0, 20))
-        Label(feels_frame, 
-             text="Feels like", 
-             font=("Helvetica", 10),
-             bg=COLORS['surface'],
-             fg=COLORS['text_secondary']).pack(anchor='w')
-        Label(feels_frame, 
-             text=f"{feels_like}°{temp_unit}", 
-             font=("Helvetica", 12, "bold"),
-             bg=COLORS['surface'],
-             fg=COLORS['text_primary']).pack(anchor='w')
-        
-        # Min/Max temp
-        minmax_frame = Frame(details_frame, bg=COLORS['surface'])
-        minmax_frame.pack(side=LEFT, padx=20)
-        Label(minmax_frame, 
-             text="Min/Max", 
-             font=("Helvetica", 10),
-             bg=COLORS['surface'],
-             fg=COLORS['text_secondary']).pack(anchor='w')
-        Label(minmax_frame, 
-             text=f"{temp_min}°{temp_unit} / {temp_max}°{temp_unit}", 
-             font=("Helvetica", 12, "bold"),
-             bg=COLORS['surface'],
-             fg=COLORS['text_primary']).pack(anchor='w')
-        
-        # Add forecast section if we have forecast data
+            log.warning("Could not retrieve forecast data for %s", city)
+
+        # previous weather display (or loading indicator)
+        clear_weather_display()
+        with tracing.span("render.current", "render"):
+            view.load(city, data, forecast_data, stale_since)
+
+            display_frame.pack(fill=BOTH, expand=True)
+
+            # Banner for a corrected city name
+            if notice is not None:
+                view.bind_colors(Label(current_area,
+                      text=notice,
+                      font=("Helvetica", 10, "italic")), bg='background', fg='text_secondary').pack(anchor='w', pady=(0, 10))
+
+            # Banner for last-known data restored from disk
+            if stale_since is not None:
+                saved_at = datetime.fromtimestamp(stale_since).strftime("%a %d %b, %H:%M")
+                status = "refreshing..." if fetcher.busy() else "could not refresh"
+                view.bind_colors(Label(current_area,
+                      text=f"Showing saved data from {saved_at} ({status})",
+                      font=("Helvetica", 10, "italic")), bg='background', fg='warning').pack(anchor='w', pady=(0, 10))
+        
+            # Current weather section
+            current_weather_frame = view.bind_colors(Frame(current_area,
+                                       bd=2,
+                                       relief=GROOVE,
+                                       padx=20,
+                                       pady=20), bg='surface')
+            current_weather_frame.pack(fill=X, pady=(0, 20))
+        
+            # Top row with city and icon
+            top_row = view.bind_colors(Frame(current_weather_frame), bg='surface')
+            top_row.pack(fill=X, pady=(0, 15))
+        
+            # City and date
+            city_date_frame = view.bind_colors(Frame(top_row), bg='surface')
+            city_date_frame.pack(side=LEFT, fill=BOTH, expand=True)
+        
+            city_label = view.bind_colors(Label(city_date_frame, 
+                             text=data.name, 
+                             font=("Helvetica", 24, "bold")), bg='surface', fg='text_primary')
+            city_label.pack(anchor='w')
+
+            current_date = datetime.now().strftime("%A, %B %d, %Y")
+            date_label = view.bind_colors(Label(city_date_frame, 
+                             text=current_date,
+                             font=("Helvetica", 12)), bg='surface', fg='text_secondary')
+            date_label.pack(anchor='w', pady=(0, 10))
+        
+            # Weather icon
+            try:
+                icon_photo = get_icon(data.icon, CURRENT_ICON_SIZE)
+                if icon_photo is not None:
+                    icon_label = view.bind_colors(Label(top_row, 
+                                     image=icon_photo), bg='surface')
+                    icon_label.pack(side=RIGHT, padx=10)
+            except Exception as e:
+                log.error("Error loading weather icon: %s", e)
+        
+            # Weather details
+            weather_desc = data.description.title()
+            desc_label = view.bind_colors(Label(city_date_frame, 
+                             text=weather_desc, 
+                             font=("Helvetica", 14)), bg='surface', fg='text_primary')
+            desc_label.pack(anchor='w', pady=(0, 10))
+        
+            # Temperature display
+            temp_frame = view.bind_colors(Frame(city_date_frame), bg='surface')
+            temp_frame.pack(anchor='w')
+        
+            temp_label = view.bind_colors(Label(temp_frame, 
+                             font=("Helvetica", 48, "bold")), bg='surface', fg='primary')
+            view.bind_temp(temp_label, data.temp)
+            temp_label.pack(side=LEFT)
+        
+            # Additional weather info
+            details_frame = view.bind_colors(Frame(city_date_frame), bg='surface')
+            details_frame.pack(fill=X, pady=(10, 0))
+        
+            # Feels like
+            feels_frame = view.bind_colors(Frame(details_frame), bg='surface')
+            feels_frame.pack(side=LEFT, padx=(0, 20))
+            view.bind_colors(Label(feels_frame, 
+                 text="Feels like", 
+                 font=("Helvetica", 10)), bg='surface', fg='text_secondary').pack(anchor='w')
+            feels_label = view.bind_colors(Label(feels_frame, 
+                 font=("Helvetica", 12, "bold")), bg='surface', fg='text_primary')
+            view.bind_temp(feels_label, data.feels_like)
+            feels_label.pack(anchor='w')
+        
+            # Min/Max temp
+            minmax_frame = view.bind_colors(Frame(details_frame), bg='surface')
+            minmax_frame.pack(side=LEFT, padx=20)
+            view.bind_colors(Label(minmax_frame, 
+                 text="Min/Max", 
+                 font=("Helvetica", 10)), bg='surface', fg='text_secondary').pack(anchor='w')
+            minmax_label = view.bind_colors(Label(minmax_frame, 
+                 font=("Helvetica", 12, "bold")), bg='surface', fg='text_primary')
+            view.bind_temp(minmax_label,
+                           (data.temp_min, data.temp_max),
+                           "{} / {}")
+            minmax_label.pack(anchor='w')
+        
+        # Forecast cards are reused from the previous search
         if forecast_data:
-            forecast_frame = Frame(main_container, bg=COLORS['background'])
-            forecast_frame.pack(fill=BOTH, expand=True)
-            display_forecast_gui(forecast_data, forecast_frame)
+            with tracing.span("render.forecast", "render"):
+                forecast_panel.show(forecast_data)
+            forecast_panel.frame.pack(fill=BOTH, expand=True, pady=(0, 5))
+        else:
+            forecast_panel.frame.pack_forget()
+
+        # Keep the display current from here on; saved data shown after a
+        # failed lookup is retried with backoff
+        if stale_since is None:
+            refresh_scheduler.start(data.observed_at)
+        elif not fetcher.busy():
+            refresh_scheduler.failed()
         
     except Exception as e:
-        print(f"Error in show_weather: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error in render_weather")
         messagebox.showerror("Error", f"Failed to fetch weather data: {e}")
+    finally:
+        if search is not None:
+            # Queued behind Tk's redraw of the new widgets
+            root.after_idle(finish_search, search)
+
+def finish_search(search):
+    """End a traced search and show its breakdown in the overlay"""
+    search.end()
+    report = search.report()
+    if report and tracing.enabled():
+        log.debug("%s", report)
+        show_trace_overlay(report)
+
+def auto_refresh():
+    """Revalidate the city on screen (called by refresh_scheduler)"""
+    city = view.city
+    if city is None or not display_frame.winfo_manager() or fetcher.busy():
+        # Nothing on screen, or a search is running; the next render
+        # restarts the schedule
+        return
+    refresher.submit(
+        {
+            # A failure keeps the display as it is and retries with backoff
+            "weather": lambda: get_weather(city, use_cache=False, fallback=False),
+            # The forecast changes every 3 hours; the cache TTL covers it
+            "forecast": lambda: get_forecast(city, fallback=False),
+        },
+        lambda results, errors: on_auto_refresh(city, results, errors)
+    )
+
+def on_auto_refresh(city, results, errors):
+    if view.city != city or fetcher.busy():
+        # Superseded by a search
+        return
+    result = results.get("weather")
+    if result is None:
+        log.info("Auto-refresh of %s failed: %s", city, errors.get("weather"))
+        refresh_scheduler.failed()
+        return
+    forecast = results.get("forecast") or ForecastResult(city, view.forecast, CACHE)
+    if (view.stale_since is None and result.conditions == view.current
+            and forecast.days == view.forecast):
+        # Same conditions as on screen: nothing to redraw
+        refresh_scheduler.start(result.conditions.observed_at)
+        return
+    render_weather(city, {"weather": result, "forecast": forecast}, {})
+
+def open_dashboard():
+    """Show the multi-city dashboard, creating it on first use"""
+    global dashboard
+    if dashboard is not None and dashboard.exists():
+        dashboard.window.deiconify()
+        dashboard.window.lift()
+        return
+    dashboard = Dashboard(root, COLORS, use_celsius)
 
 def auto_detect_location():
-    def detect_with_geocoder():
-        try:
-            g = geocoder.ip('me')
-            if g.ok and g.city:
-                return g.city, None
-        except Exception as e:
-            return None, str(e)
-        return None, "Geocoder service unavailable"
-    
-    def detect_with_ipapi():
-        try:
-            response = requests.get('https://ipapi.co/json/', timeout=3)
-            data = response.json()
-            if 'city' in data and data['city']:
-                return data['city'], None
-        except Exception as e:
-            return None, str(e)
-        return None, "ipapi service unavailable"
-        
-    def detect_with_ipinfo():
-        try:
-            response = requests.get('https://ipinfo.io/json', timeout=3)
-            data = response.json()
-            if 'city' in data and data['city']:
-                return data['city'], None
-        except Exception as e:
-            return None, str(e)
-        return None, "ipinfo service unavailable"
-        
-    def detect_with_ipgeolocation():
-        if not IPGEOLOCATION_API_KEY:
-            return None, "IPGeolocation API key not configured"
-        try:
-            response = requests.get(
-                'https://api.ipgeolocation.io/ipgeo',
-                params={'apiKey': IPGEOLOCATION_API_KEY},
-                timeout=3
-            )
-            data = response.json()
-            if 'city' in data and data['city']:
-                return data['city'], None
-            return None, data.get('message', 'Unknown error from IPGeolocation')
-        except Exception as e:
-            return None, str(e)
-
-    # Show loading state
+    # Show loading state; the lookup (cached per public IP, otherwise a race
+    # between providers) runs on a worker thread
     auto_detect_btn.config(state=tk.DISABLED, text="Detecting...")
-    root.update()
-    
-    try:
-        # Try multiple detection methods
-        detection_methods = [
-            ("IPGeolocation", detect_with_ipgeolocation) if IPGEOLOCATION_API_KEY else None,
-            ("Geocoder", detect_with_geocoder),
-            ("ipapi", detect_with_ipapi),
-            ("ipinfo", detect_with_ipinfo)
-        ]
-        
-        # Remove None values (in case IPGeolocation is not configured)
-        detection_methods = [m for m in detection_methods if m is not None]
-        
-        last_error = "No detection methods available"
-        for service_name, method in detection_methods:
-            city, error = method()
-            if city:
-                city_entry.delete(0, tk.END)
-                city_entry.insert(0, city)
-                show_weather()
-                break
-            last_error = f"{service_name} failed: {error}"
-        else:
-            messagebox.showerror(
-                "Location Error",
-                f"Could not detect your location.\n\n"
-                f"Please enter your city manually.\n"
-                f"Last error: {last_error}"
-            )
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to detect location: {str(e)}")
-    finally:
-        auto_detect_btn.config(state=tk.NORMAL, text="📍 Auto Detect")
+    detector.submit({"location": locate}, on_location_detected)
+
+def on_location_detected(results, errors):
+    auto_detect_btn.config(state=tk.NORMAL, text="📍 Auto Detect")
+
+    if "location" in errors:
+        messagebox.showerror("Error", f"Failed to detect location: {errors['location']}")
+        return
+
+    city, service_name, last_error = results["location"]
+    if city:
+        city_entry.delete(0, tk.END)
+        city_entry.insert(0, city)
+        show_weather()
+    else:
+        messagebox.showerror(
+            "Location Error",
+            f"Could not detect your location.\n\n"
+            f"Please enter your city manually.\n"
+            f"Last error: {last_error}"
+        )
 
 # GUI Setup
 root = tk.Tk()
@@ -698,6 +533,18 @@ theme_btn = Button(header_frame,
                  relief=FLAT)
 theme_btn.pack(side=RIGHT, padx=5)
 
+# OpenWeatherMap calls made today, across the CLI and the GUI
+usage_label = Label(header_frame,
+                   font=("Helvetica", 9),
+                   bg=COLORS['background'],
+                   fg=COLORS['text_secondary'])
+usage_label.pack(side=LEFT, padx=5)
+
+def update_usage():
+    """Refresh the API usage readout every few seconds"""
+    usage_label.config(text=owm_client.usage_summary())
+    root.after(USAGE_REFRESH_MS, update_usage)
+
 # App title with weather icon
 title_frame = Frame(header_frame, bg=COLORS['background'])
 title_frame.pack(fill=X)  
@@ -753,6 +600,59 @@ city_entry = Entry(city_frame,
 city_entry.pack(side=LEFT, padx=(0, 10), ipady=6)
 city_entry.focus()
 
+# City name suggestions from the offline index, shown under the entry
+suggestion_box = Listbox(root,
+                        font=("Helvetica", 12),
+                        height=6,
+                        bd=1,
+                        relief=SOLID,
+                        activestyle='none',
+                        bg=COLORS['surface'],
+                        fg=COLORS['text_primary'],
+                        selectbackground=COLORS['primary_light'])
+
+def hide_suggestions(event=None):
+    suggestion_box.place_forget()
+
+def update_suggestions(event):
+    if event.keysym in ("Return", "Escape", "Down", "Up", "Tab"):
+        return
+    text = city_entry.get().strip()
+    matches = city_index.complete(text, limit=6) if len(text) >= 2 else []
+    if not matches:
+        hide_suggestions()
+        return
+    suggestion_box.delete(0, tk.END)
+    for match in matches:
+        suggestion_box.insert(tk.END, label_for_city(match))
+    suggestion_box.config(height=len(matches))
+    suggestion_box.place(x=city_entry.winfo_rootx() - root.winfo_rootx(),
+                         y=city_entry.winfo_rooty() - root.winfo_rooty() + city_entry.winfo_height(),
+                         width=city_entry.winfo_width())
+    suggestion_box.lift()
+
+def focus_suggestions(event):
+    if suggestion_box.winfo_ismapped():
+        suggestion_box.focus_set()
+        suggestion_box.selection_clear(0, tk.END)
+        suggestion_box.selection_set(0)
+        suggestion_box.activate(0)
+
+def choose_suggestion(event=None):
+    selection = suggestion_box.curselection()
+    if selection:
+        city_entry.delete(0, tk.END)
+        city_entry.insert(0, suggestion_box.get(selection[0]))
+    city_entry.focus_set()
+    show_weather()
+
+city_entry.bind("<KeyRelease>", update_suggestions)
+city_entry.bind("<Down>", focus_suggestions)
+city_entry.bind("<Escape>", hide_suggestions)
+suggestion_box.bind("<Return>", choose_suggestion)
+suggestion_box.bind("<ButtonRelease-1>", choose_suggestion)
+suggestion_box.bind("<Escape>", lambda event: (hide_suggestions(), city_entry.focus_set()))
+
 # Button frame
 button_frame = Frame(search_container, name='button_frame', bg=COLORS['background'])
 button_frame.pack(side=LEFT, padx=(15, 0))
@@ -785,8 +685,114 @@ auto_detect_btn = Button(button_frame,
                         relief=FLAT)
 auto_detect_btn.pack(side=LEFT)
 
+dashboard_btn = Button(button_frame, 
+                      text="▦ Dashboard",  
+                      command=open_dashboard,
+                      bg=COLORS['accent'], 
+                      fg='white',
+                      activebackground=COLORS['primary_dark'],
+                      activeforeground='white',
+                      font=("Segoe UI Emoji", 12, "bold"),
+                      padx=20, 
+                      pady=6, 
+                      bd=0,
+                      relief=FLAT)
+dashboard_btn.pack(side=LEFT, padx=(10, 0))
+
 # Weather info container
 weather_container = Frame(main_frame, bg=COLORS['background'])
 weather_container.pack(fill=BOTH, expand=True, pady=(10, 0))
 
+# Weather display, packed while a city is shown: the current conditions
+# (rebuilt per search) above the reusable forecast cards
+display_frame = Frame(weather_container, bg=COLORS['background'], padx=20, pady=20)
+current_area = Frame(display_frame, bg=COLORS['background'])
+current_area.pack(fill=X)
+forecast_panel = ForecastPanel(display_frame, COLORS, use_celsius)
+
+# Per-stage timing of the last search, shown while tracing is on (F12)
+trace_overlay = Label(root, font=("Courier", 9), justify=LEFT, anchor='nw',
+                      bg=COLORS['surface'], fg=COLORS['text_secondary'],
+                      bd=1, relief=SOLID, padx=8, pady=6)
+
+def show_trace_overlay(text="Tracing on: search for a city"):
+    trace_overlay.config(text=text)
+    trace_overlay.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor='se')
+
+def toggle_tracing(event=None):
+    """Turn stage timing and its overlay on or off"""
+    if tracing.enabled():
+        tracing.disable()
+        trace_overlay.place_forget()
+    else:
+        tracing.enable(tracing.TRACE_FILE)
+        show_trace_overlay()
+
+root.bind("<F12>", toggle_tracing)
+if tracing.enabled():
+    show_trace_overlay()
+
+# Background fetches for searches, location detection and auto-refresh
+fetcher = FetchExecutor(root)
+detector = FetchExecutor(root, max_workers=1)
+refresher = FetchExecutor(root, max_workers=2)
+
+# Periodic revalidation of the city on screen
+refresh_scheduler = RefreshScheduler(root, auto_refresh)
+
+def on_close():
+    refresh_scheduler.stop()
+    fetcher.shutdown()
+    detector.shutdown()
+    refresher.shutdown()
+    if dashboard is not None and dashboard.exists():
+        dashboard.close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+
+def restore_last_city():
+    """Show the last city straight from disk, then refresh it in the background"""
+    city = store.last_city()
+    if not city:
+        # First run: start from the detected location if one is cached
+        city = cached_city()
+        if city:
+            city_entry.insert(0, city)
+            show_weather()
+        return
+    saved = weather_client.load_saved("weather", city)
+    if saved is None:
+        return
+    city_entry.insert(0, city)
+    show_weather(revalidate=True)
+    forecast = weather_client.load_saved("forecast", city)
+    render_weather(city,
+                   {"weather": WeatherResult(city, saved[0], SAVED, saved[1]),
+                    "forecast": ForecastResult(city, forecast[0], SAVED, forecast[1])
+                                if forecast else None},
+                   {})
+
+def warm_up():
+    """Load what the first search needs, off the Tk thread"""
+    city_index.load()
+    http_client.get_session()
+    icon_cache.preload()
+    store.compact()
+
+# Paint the window before any slow start-up work
+root.update()
+if EXIT_AFTER_PAINT:
+    print(f"first_paint_ms={(time.perf_counter() - STARTED) * 1000:.1f}")
+    root.destroy()
+    raise SystemExit(0)
+
+threading.Thread(target=warm_up, daemon=True).start()
+
+root.after_idle(restore_last_city)
+root.after_idle(update_usage)
+
+if WARM_ICONS:
+    root.after_idle(warm_icons, root)
+
 root.mainloop()
@@ -0,0 +1,159 @@
+"""Shared HTTP client for every outbound call made by the CLI and the GUI.
+
+All requests go through one pooled requests.Session, so repeated lookups
+reuse warm keep-alive connections instead of paying a new TCP+TLS handshake
+each time. Each host gets its own timeouts. Connection failures, 429 and 5xx
+responses are retried with jittered exponential backoff, and per-host timing
+is recorded for every request. With tracing on, each attempt is a
+"http.get" span noting whether it had to open a new connection (DNS, TCP
+and TLS) or reused a pooled one.
+
+requests itself is imported on first use, so importing this module is cheap
+for callers (like the GUI) that may not make a request straight away.
+"""
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import tracing
+from weather_logging import get_logger
+
+log = get_logger(__name__)
+
+# Connections kept alive per host, and number of hosts pooled
+POOL_SIZE = 10
+POOL_HOSTS = 8
+
+# (connect, read) timeouts in seconds per host
+TIMEOUTS = {
+    "api.openweathermap.org": (3.05, 10),
+    "openweathermap.org": (5, 15),
+    "ipapi.co": (2, 3),
+    "ipinfo.io": (2, 3),
+    "api.ipgeolocation.io": (2, 3),
+    "api.ipify.org": (2, 2),
+}
+DEFAULT_TIMEOUT = (5, 10)
+
+# Attempts per request and which responses are worth retrying
+MAX_ATTEMPTS = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Backoff before retry n is about BACKOFF_BASE * 2**n seconds, with jitter
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def timeout_for(url):
+    return TIMEOUTS.get(urlsplit(url).hostname, DEFAULT_TIMEOUT)
+
+
+def backoff_delay(attempt, response=None):
+    """Seconds to wait before retrying after the given (1-based) attempt"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    delay = min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.5)
+
+
+def _record(host, elapsed, failed=False, retried=False):
+    with _stats_lock:
+        entry = _stats.setdefault(host, {
+            "requests": 0, "failures": 0, "retries": 0,
+            "total_time": 0.0, "max_time": 0.0,
+        })
+        entry["requests"] += 1
+        entry["total_time"] += elapsed
+        entry["max_time"] = max(entry["max_time"], elapsed)
+        if failed:
+            entry["failures"] += 1
+        if retried:
+            entry["retries"] += 1
+
+
+def _connections(session, url, host):
+    """Connections opened so far to host by the session's pools, or None"""
+    try:
+        pools = session.get_adapter(url).poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys()
+                   if getattr(key, "key_host", host) == host)
+    except Exception:
+        return None
+
+
+def get(url, params=None, headers=None, timeout=None, max_attempts=MAX_ATTEMPTS):
+    """GET url through the shared session, retrying transient failures.
+
+    Returns the final response without raising for its status; callers
+    decide what an error status means. Connection errors are raised once
+    every attempt has failed. Read timeouts are not retried, since the
+    server may still be working on the first request.
+    """
+    import requests
+
+    session = get_session()
+    host = urlsplit(url).hostname
+    if timeout is None:
+        timeout = timeout_for(url)
+
+    for attempt in range(1, max_attempts + 1):
+        last_attempt = attempt == max_attempts
+        started = time.perf_counter()
+        try:
+            with tracing.span("http.get", "net", host=host, attempt=attempt) as span:
+                opened = _connections(session, url, host) if tracing.enabled() else None
+                response = session.get(url, params=params, headers=headers, timeout=timeout)
+                span.set(status=response.status_code,
+                         headers_ms=response.elapsed.total_seconds() * 1000)
+                if opened is not None:
+                    span.set(new_connection=_connections(session, url, host) != opened)
+        except requests.exceptions.ConnectionError as e:
+            _record(host, time.perf_counter() - started, failed=True, retried=not last_attempt)
+            if last_attempt:
+                raise
+            log.info("Retrying %s after connection error (attempt %d): %s", host, attempt, e)
+            time.sleep(backoff_delay(attempt))
+            continue
+        except requests.exceptions.RequestException:
+            _record(host, time.perf_counter() - started, failed=True)
+            raise
+
+        elapsed = time.perf_counter() - started
+        retry = response.status_code in RETRY_STATUSES and not last_attempt
+        _record(host, elapsed, failed=response.status_code >= 400, retried=retry)
+        log.debug("GET %s -> %d in %.0f ms", host, response.status_code, elapsed * 1000)
+        if not retry:
+            return response
+        log.info("Retrying %s after HTTP %d (attempt %d)", host, response.status_code, attempt)
+        time.sleep(backoff_delay(attempt, response))
+
+
+def stats():
+    """Return a copy of the per-host request counters and timings"""
+    with _stats_lock:
+        return {host: dict(entry) for host, entry in _stats.items()}
@@ -0,0 +1,143 @@
+"""Decoded weather icons shared by the current and forecast panels.
+
+Each (icon_code, size) pair is decoded and resized once and the PhotoImage is
+kept alive here, so repeated searches do no image decoding at all.
+PhotoImages belong to the Tk interpreter: only use this from the Tk thread,
+after the root window has been created.
+
+Icons come from the atlas written by build_icon_atlas.py when it exists
+(one read for every icon, already resized), otherwise from the PNGs that
+download_icons.py fetches. Pillow is only imported when the first icon is
+decoded, or ahead of time by preload().
+"""
+import json
+import os
+import struct
+import threading
+
+import tracing
+from download_icons import icon_codes, icon_folder
+from weather_logging import get_logger
+
+log = get_logger(__name__)
+
+# Sizes used by the GUI: forecast cards and the current weather panel
+FORECAST_ICON_SIZE = 40
+CURRENT_ICON_SIZE = 100
+ICON_SIZES = (FORECAST_ICON_SIZE, CURRENT_ICON_SIZE)
+
+ATLAS_MAGIC = b"WXICONS1"
+ATLAS_PATH = os.path.join(icon_folder, "atlas.bin")
+
+# (icon_code, size) -> PhotoImage, or None when there is no icon
+_icons = {}
+
+# Parsed atlas: (sizes, index, pixel data), or None if there is no atlas
+_atlas = None
+_atlas_loaded = False
+_atlas_lock = threading.Lock()
+
+
+def load_atlas(path=ATLAS_PATH):
+    """Read the icon atlas in one go; returns None if it is missing or invalid"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        log.error("Error reading icon atlas: %s", e)
+        return None
+
+    start = len(ATLAS_MAGIC)
+    if data[:start] != ATLAS_MAGIC:
+        log.warning("Ignoring icon atlas %s: unknown format", path)
+        return None
+    (header_len,) = struct.unpack_from("<I", data, start)
+    start += 4
+    header = json.loads(data[start:start + header_len])
+    pixels = memoryview(data)[start + header_len:]
+    return set(header["sizes"]), header["icons"], pixels
+
+
+def _get_atlas():
+    global _atlas, _atlas_loaded
+    with _atlas_lock:
+        if not _atlas_loaded:
+            _atlas = load_atlas()
+            _atlas_loaded = True
+    return _atlas
+
+
+def preload():
+    """Import Pillow and read the atlas; safe to call from a worker thread"""
+    from PIL import Image, ImageTk  # noqa: F401
+
+    _get_atlas()
+
+
+def _icon_from_atlas(atlas, icon_code, size):
+    from PIL import Image, ImageTk
+
+    sizes, index, pixels = atlas
+    entry = index.get(f"{icon_code}@{size}")
+    if entry is None:
+        # Missing icons were already resolved when the atlas was packed
+        return None
+    offset, width, height = entry
+    icon_image = Image.frombuffer("RGBA", (width, height),
+                                  pixels[offset:offset + width * height * 4],
+                                  "raw", "RGBA", 0, 1)
+    return ImageTk.PhotoImage(icon_image)
+
+
+def _icon_from_file(icon_code, size):
+    from PIL import Image, ImageTk
+
+    icon_path = os.path.join(icon_folder, f"{icon_code}.png")
+    if not os.path.exists(icon_path):
+        return None
+    with Image.open(icon_path) as source:
+        icon_image = source.resize((size, size), Image.Resampling.LANCZOS)
+    return ImageTk.PhotoImage(icon_image)
+
+
+def get_icon(icon_code, size):
+    """Return the icon resized to size x size, or None if it is not available"""
+    key = (icon_code, size)
+    if key in _icons:
+        return _icons[key]
+
+    with tracing.span("icon.decode", "render", icon=icon_code, size=size):
+        atlas = _get_atlas()
+        if atlas is not None and size in atlas[0]:
+            photo = _icon_from_atlas(atlas, icon_code, size)
+        else:
+            photo = _icon_from_file(icon_code, size)
+    # Missing icons are remembered too so they are not looked up again
+    _icons[key] = photo
+    return photo
+
+
+def warm_icons(root, codes=icon_codes, sizes=ICON_SIZES, delay=10):
+    """Decode every icon ahead of time without blocking the event loop.
+
+    One icon is decoded per Tk callback, delay milliseconds apart, so the
+    window stays responsive while the registry fills up.
+    """
+    pending = [(code, size) for size in sizes for code in codes]
+
+    def warm_next():
+        while pending:
+            key = pending.pop()
+            if key in _icons:
+                continue
+            try:
+                get_icon(*key)
+            except Exception as e:
+                log.error("Error warming icon %s: %s", key[0], e)
+            break
+        if pending:
+            root.after(delay, warm_next)
+
+    root.after(delay, warm_next)
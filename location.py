@@ -0,0 +1,274 @@
+"""Detect the user's city from their public IP address.
+
+Several geolocation providers are raced instead of being tried one after
+another. The provider that has been fastest and most reliable so far starts
+first. If it has not answered within HEDGE_DELAY seconds the rest are started
+too, and the first valid city wins. Latency and success counts for every
+provider are kept in the on-disk store so the ranking carries over between
+runs.
+
+The detected city is also cached against the public IP address it was
+detected from. locate() only races the providers again when the cache has
+expired or the public IP has changed, and cached_city() returns the last
+city instantly without any network access.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+import http_client
+from weather_store import store
+from weather_logging import get_logger
+
+load_dotenv()
+
+log = get_logger(__name__)
+IPGEOLOCATION_API_KEY = os.getenv("IPGEOLOCATION_API_KEY")
+
+# Seconds the favoured provider runs alone before the others are started
+HEDGE_DELAY = 0.3
+
+# Seconds to wait for any provider to come back with a city
+DETECT_TIMEOUT = 6
+
+# Seconds a detected city stays valid for the same public IP
+LOCATION_TTL = float(os.getenv("LOCATION_CACHE_TTL", "86400"))
+
+# Cheap endpoint that returns the caller's public IP as plain text
+PUBLIC_IP_URL = os.getenv("PUBLIC_IP_URL", "https://api.ipify.org")
+
+# Provider endpoints, overridable to point at a mock server
+IPAPI_URL = os.getenv("IPAPI_URL", "https://ipapi.co/json/")
+IPINFO_URL = os.getenv("IPINFO_URL", "https://ipinfo.io/json")
+
+# Comma-separated provider names to use (e.g. "ipapi,ipinfo"); all when unset
+LOCATION_PROVIDERS = os.getenv("LOCATION_PROVIDERS", "")
+
+
+def detect_with_geocoder():
+    try:
+        # geocoder pulls in a large dependency tree; only load it when asked
+        import geocoder
+
+        g = geocoder.ip('me', session=http_client.get_session())
+        if g.ok and g.city:
+            return g.city, None
+    except Exception as e:
+        return None, str(e)
+    return None, "Geocoder service unavailable"
+
+
+def detect_with_ipapi():
+    try:
+        response = http_client.get(IPAPI_URL)
+        data = response.json()
+        if 'city' in data and data['city']:
+            return data['city'], None
+    except Exception as e:
+        return None, str(e)
+    return None, "ipapi service unavailable"
+
+
+def detect_with_ipinfo():
+    try:
+        response = http_client.get(IPINFO_URL)
+        data = response.json()
+        if 'city' in data and data['city']:
+            return data['city'], None
+    except Exception as e:
+        return None, str(e)
+    return None, "ipinfo service unavailable"
+
+
+def detect_with_ipgeolocation():
+    if not IPGEOLOCATION_API_KEY:
+        return None, "IPGeolocation API key not configured"
+    try:
+        response = http_client.get(
+            'https://api.ipgeolocation.io/ipgeo',
+            params={'apiKey': IPGEOLOCATION_API_KEY}
+        )
+        data = response.json()
+        if 'city' in data and data['city']:
+            return data['city'], None
+        return None, data.get('message', 'Unknown error from IPGeolocation')
+    except Exception as e:
+        return None, str(e)
+
+
+def available_providers():
+    """Providers in their default order of preference"""
+    providers = [
+        ("IPGeolocation", detect_with_ipgeolocation) if IPGEOLOCATION_API_KEY else None,
+        ("Geocoder", detect_with_geocoder),
+        ("ipapi", detect_with_ipapi),
+        ("ipinfo", detect_with_ipinfo)
+    ]
+    # Remove None values (in case IPGeolocation is not configured)
+    providers = [p for p in providers if p is not None]
+    if LOCATION_PROVIDERS:
+        enabled = {name.strip().casefold() for name in LOCATION_PROVIDERS.split(",")}
+        providers = [p for p in providers if p[0].casefold() in enabled]
+    return providers
+
+
+# Provider name -> {"attempts", "successes", "total_time"}
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def _load_stats():
+    global _stats
+    if _stats is None:
+        try:
+            _stats = json.loads(store.get_meta("provider_stats") or "{}")
+        except ValueError:
+            _stats = {}
+    return _stats
+
+
+def _record(name, elapsed, success):
+    with _stats_lock:
+        entry = _load_stats().setdefault(name, {"attempts": 0, "successes": 0, "total_time": 0.0})
+        entry["attempts"] += 1
+        entry["total_time"] += elapsed
+        if success:
+            entry["successes"] += 1
+        snapshot = json.dumps(_stats)
+    store.set_meta("provider_stats", snapshot)
+
+
+def provider_stats():
+    """Return a copy of the per-provider latency and success counters"""
+    with _stats_lock:
+        return {name: dict(entry) for name, entry in _load_stats().items()}
+
+
+def ranked_providers():
+    """Available providers, most reliable and then fastest first.
+
+    Providers with no history keep their default order ahead of ones that
+    have failed, so each gets tried.
+    """
+    stats = provider_stats()
+
+    def rank(provider):
+        entry = stats.get(provider[0])
+        if not entry or not entry["attempts"]:
+            return (0.0, 0.0)
+        success_rate = entry["successes"] / entry["attempts"]
+        mean_time = entry["total_time"] / entry["attempts"]
+        return (-success_rate, mean_time)
+
+    return sorted(available_providers(), key=rank)
+
+
+def detect_city(hedge_delay=HEDGE_DELAY, timeout=DETECT_TIMEOUT):
+    """Race the providers and return (city, provider_name, last_error).
+
+    city is None when no provider found one in time. Providers still running
+    when a winner is found are left to finish in the background (an HTTP
+    request in flight cannot be interrupted); their answers only update the
+    latency statistics.
+    """
+    providers = ranked_providers()
+    if not providers:
+        return None, None, "No detection methods available"
+
+    def run(name, method):
+        started = time.perf_counter()
+        try:
+            city, error = method()
+        except Exception as e:
+            city, error = None, str(e)
+        _record(name, time.perf_counter() - started, bool(city))
+        return name, city, error
+
+    pool = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="locate")
+    deadline = time.monotonic() + timeout
+    last_error = "Location detection timed out"
+    try:
+        # Favoured provider first, then hedge with the rest
+        pending = {pool.submit(run, *providers[0])}
+        waiting = list(providers[1:])
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_time = min(hedge_delay, remaining) if waiting else remaining
+            done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, city, error = future.result()
+                if city:
+                    return city, name, None
+                last_error = f"{name} failed: {error}"
+            if waiting and (not done or not pending):
+                # Slow or failed: start everything else at once
+                pending |= {pool.submit(run, *provider) for provider in waiting}
+                waiting = []
+        return None, None, last_error
+    finally:
+        pool.shutdown(wait=False)
+
+
+def get_public_ip():
+    """Return this host's public IP address, or None if it can't be found"""
+    try:
+        response = http_client.get(PUBLIC_IP_URL, max_attempts=1)
+        response.raise_for_status()
+        return response.text.strip() or None
+    except Exception as e:
+        log.warning("Public IP lookup failed: %s", e)
+        return None
+
+
+def _load_cached_location():
+    try:
+        return json.loads(store.get_meta("location") or "null")
+    except ValueError:
+        return None
+
+
+def cached_city(ttl=LOCATION_TTL):
+    """Return the last detected city if it has not expired, without any network access"""
+    cached = _load_cached_location()
+    if cached and time.time() - cached["detected_at"] < ttl:
+        return cached["city"]
+    return None
+
+
+def locate(ttl=LOCATION_TTL):
+    """Return (city, provider_name, last_error), reusing the cached city
+    while it is fresh and the public IP is unchanged.
+    """
+    cached = _load_cached_location()
+    if cached and time.time() - cached["detected_at"] < ttl:
+        ip = get_public_ip()
+        # When the IP can't be checked, trust the cache rather than
+        # hitting every provider
+        if ip is None or ip == cached["ip"]:
+            return cached["city"], "cache", None
+        city, provider, error = detect_city()
+    else:
+        # Nothing to check the IP against: look it up alongside the race,
+        # only to key the cache entry
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="public-ip")
+        try:
+            ip_future = pool.submit(get_public_ip)
+            city, provider, error = detect_city()
+            ip = ip_future.result()
+        finally:
+            pool.shutdown(wait=False)
+
+    if city:
+        store.set_meta("location", json.dumps({
+            "ip": ip,
+            "city": city,
+            "provider": provider,
+            "detected_at": time.time(),
+        }))
+    return city, provider, error
@@ -1,6 +1,21 @@
-import requests
 import os
+import sys
+import csv
+import json
+import time
+import argparse
+import atexit
+from datetime import datetime
 from dotenv import load_dotenv
+from city_index import city_label, UnknownCity
+import owm_client
+import service_client
+import tracing
+from rate_limit import RateLimiter
+from weather_batch import iter_weather
+from weather_cache import normalize_city
+from weather_core import weather_client, describe_error, is_not_found
+from weather_store import store
 
 # Load .env file
 load_dotenv()
@@ -8,37 +23,174 @@ load_dotenv()
 # Get the API key from .env
 API_KEY = os.getenv("WEATHER_API_KEY")
 
+# Batch mode defaults: parallel lookups and OpenWeatherMap requests per second
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10
+
+# Columns written in batch mode
+BATCH_FIELDS = ["city", "name", "temperature", "feels_like", "humidity",
+                "condition", "wind_speed", "error"]
+
+def print_weather(conditions):
+    print("\n Weather in", conditions.name)
+    print(" Temperature:", conditions.temp, "°C")
+    print(" Humidity:", conditions.humidity, "%")
+    print(" Condition:", conditions.description.title())
+    print(" Wind Speed:", conditions.wind_speed, "m/s")
+
+def can_look_up():
+    """Lookups need an API key, unless a weather service makes them for us"""
+    return bool(API_KEY) or service_client.enabled()
+
 def get_weather(city):
-    if not API_KEY:
+    if not can_look_up():
         print("API key not found. Check your .env file.")
         return
 
-    base_url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
-        "q": city,
-        "appid": API_KEY,
-        "units": "metric"
-    }
-
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        print("\n Weather in", data['name'])
-        print(" Temperature:", data['main']['temp'], "°C")
-        print(" Humidity:", data['main']['humidity'], "%")
-        print(" Condition:", data['weather'][0]['description'].title())
-        print(" Wind Speed:", data['wind']['speed'], "m/s")
-
-    except requests.exceptions.HTTPError as http_err:
-        if response.status_code == 404:
+        try:
+            result = weather_client.weather(city, fallback=True)
+        except UnknownCity as err:
+            if not err.suggestions:
+                raise
+            # Likely a typo: show the closest known city instead
+            city = city_label(err.suggestions[0])
+            print(f" No city called '{err.query}'; showing {city} instead.")
+            result = weather_client.weather(city, fallback=True)
+    except Exception as err:
+        if is_not_found(err):
             print("City not found. Please check the spelling.")
         else:
-            print(f" HTTP error occurred: {http_err}")
-    except Exception as err:
-        print(f" Other error occurred: {err}")
+            print(f" Could not get the weather: {describe_error(err)}")
+        return
+
+    if result.stale:
+        # Offline or out of quota: this is the last saved copy
+        saved_at = datetime.fromtimestamp(result.fetched_at).strftime("%a %d %b, %H:%M")
+        print(f"\n Could not refresh ({describe_error(result.error)}); "
+              f"showing saved data from {saved_at}")
+    else:
+        store.set_last_city(city)
+    print_weather(result.conditions)
+
+def weather_record(city, conditions=None, error=None):
+    """Flatten one batch result into a row of BATCH_FIELDS"""
+    record = dict.fromkeys(BATCH_FIELDS)
+    record["city"] = city
+    if conditions is not None:
+        record.update(
+            name=conditions.name,
+            temperature=conditions.temp,
+            feels_like=conditions.feels_like,
+            humidity=conditions.humidity,
+            condition=conditions.description,
+            wind_speed=conditions.wind_speed,
+        )
+    if error is not None:
+        record["error"] = error
+    return record
+
+def read_cities(args):
+    """Collect batch cities from the command line, --file paths and stdin ("-")"""
+    cities = [c for c in args.cities if c != "-"]
+    sources = list(args.file or [])
+    if "-" in args.cities:
+        sources.append("-")
+    for source in sources:
+        f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+        with f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    cities.append(line)
+    return cities
+
+def run_batch(cities, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+              output_format="jsonl", out=sys.stdout):
+    """Look up many cities concurrently and stream one record per city to out.
+
+    Records are written as each lookup completes, so their order follows
+    completion rather than input. Repeated cities share a single lookup, and
+    cities seen before are fetched 20 at a time through the group endpoint.
+    Returns the number of failed cities.
+    """
+    # Duplicate cities (ignoring case and spacing) cost one request
+    by_key = {}
+    for city in cities:
+        by_key.setdefault(normalize_city(city), []).append(city)
+
+    limiter = RateLimiter(rate) if rate else None
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=BATCH_FIELDS)
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        write = lambda record: out.write(json.dumps(record) + "\n")
+
+    started = time.perf_counter()
+    failed = 0
+    for city, conditions, error in iter_weather(cities, concurrency, limiter):
+        names = by_key[normalize_city(city)]
+        if error is not None:
+            error = describe_error(error)
+            failed += len(names)
+        for name in names:
+            write(weather_record(name, conditions, error))
+        out.flush()
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(cities)} cities ({len(by_key)} unique) in {elapsed:.2f}s: "
+          f"{len(cities) - failed} ok, {failed} failed, "
+          f"{len(by_key) / elapsed if elapsed else 0:.1f} lookups/s",
+          file=sys.stderr)
+    print(owm_client.usage_summary(), file=sys.stderr)
+    return failed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Show current weather. With no cities, prompts for one; "
+                    "otherwise looks up every city given and prints one record each."
+    )
+    parser.add_argument("cities", nargs="*",
+                        help='cities to look up; "-" reads one city per line from stdin')
+    parser.add_argument("-f", "--file", action="append",
+                        help='file with one city per line ("-" for stdin); may be repeated')
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"parallel lookups (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("-r", "--rate", type=float, default=DEFAULT_RATE,
+                        help=f"max API requests per second, 0 for no limit (default {DEFAULT_RATE})")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl",
+                        help="batch output format (default jsonl)")
+    parser.add_argument("--usage", action="store_true",
+                        help="show today's OpenWeatherMap API usage and exit")
+    parser.add_argument("--trace", action="store_true",
+                        help="print a per-stage timing breakdown to stderr on exit")
+    parser.add_argument("--trace-file", metavar="PATH",
+                        help="also write a Chrome trace file to PATH (implies --trace)")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    city = input("Enter city name: ")
-    get_weather(city)
+    args = parse_args()
+    if args.trace or args.trace_file:
+        tracing.enable(args.trace_file)
+        atexit.register(lambda: print(tracing.summary(), file=sys.stderr))
+
+    if args.usage:
+        print(owm_client.usage_summary())
+        print(f"Rate limit: {owm_client.OWM_RATE_PER_MINUTE:g} calls/minute")
+        sys.exit(0)
+
+    if args.cities or args.file:
+        if not can_look_up():
+            sys.exit("API key not found. Check your .env file.")
+        with tracing.span("batch"):
+            failed = run_batch(read_cities(args), args.concurrency, args.rate, args.format)
+        sys.exit(1 if failed else 0)
+
+    last_city = store.last_city()
+    if last_city:
+        city = input(f"Enter city name [{last_city}]: ").strip() or last_city
+    else:
+        city = input("Enter city name: ")
+    with tracing.span("lookup", city=city):
+        get_weather(city)
@@ -0,0 +1,138 @@
+"""Single path for every OpenWeatherMap API request.
+
+All call sites (the CLI, the GUI, batch lookups and the dashboard) share:
+
+- one token bucket, so together they stay under the per-minute limit;
+- a daily call counter persisted in the weather store, checked before each
+  request and shared across runs and processes;
+- request coalescing, so identical requests in flight at the same time
+  cost one call and share its response.
+
+Transient failures are retried here rather than inside http_client, so
+every attempt, including one that raises, takes a limiter token and counts
+as a call against the daily quota.
+
+Callers use cache_first() to decide whether to serve cached data even when
+they would normally refetch: it is True while the per-minute bucket is
+empty or the daily budget is nearly spent.
+"""
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+import http_client
+import tracing
+from rate_limit import QuotaCounter, RateLimiter, SingleFlight
+from weather_logging import get_logger
+from weather_store import store
+
+load_dotenv()
+
+log = get_logger(__name__)
+
+# Base URL of the data API; overridable to point at a mock server
+API_BASE = os.getenv("OWM_API_URL", "https://api.openweathermap.org/data/2.5").rstrip("/")
+
+# Free-tier limits: 60 calls a minute, about 1,000,000 a month
+OWM_RATE_PER_MINUTE = float(os.getenv("OWM_RATE_PER_MINUTE", "60"))
+OWM_DAILY_QUOTA = int(os.getenv("OWM_DAILY_QUOTA", "30000"))
+
+# Requests that may go out back to back after an idle spell
+OWM_BURST = 10
+
+# Fraction of the daily quota kept back: below it, cached data is preferred
+QUOTA_RESERVE = 0.1
+
+limiter = RateLimiter(OWM_RATE_PER_MINUTE / 60, burst=OWM_BURST)
+quota = QuotaCounter(store, OWM_DAILY_QUOTA)
+_flights = SingleFlight()
+
+_stats = {"requests": 0, "coalesced": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _attempt(url, params):
+    """One request: a limiter token and a quota call, even if it raises"""
+    with tracing.span("owm.throttle", "net"):
+        quota.check()
+        limiter.acquire()
+    try:
+        return http_client.get(url, params=params, max_attempts=1)
+    finally:
+        quota.record()
+        _count("requests")
+
+
+def _request(url, params):
+    # Retried here rather than in http_client so every attempt waits for
+    # the limiter and counts against the quota
+    import requests
+
+    for attempt in range(1, http_client.MAX_ATTEMPTS + 1):
+        last_attempt = attempt == http_client.MAX_ATTEMPTS
+        try:
+            response = _attempt(url, params)
+        except requests.exceptions.ConnectionError as e:
+            if last_attempt:
+                raise
+            log.info("Retrying OpenWeatherMap after connection error (attempt %d): %s",
+                     attempt, e)
+            time.sleep(http_client.backoff_delay(attempt))
+            continue
+        if response.status_code not in http_client.RETRY_STATUSES or last_attempt:
+            return response
+        log.info("Retrying OpenWeatherMap after HTTP %d (attempt %d)",
+                 response.status_code, attempt)
+        time.sleep(http_client.backoff_delay(attempt, response))
+
+
+def get(url, params):
+    """GET an OpenWeatherMap endpoint; returns the response like http_client.get.
+
+    Raises rate_limit.QuotaExceeded without making a request once today's
+    quota is used up.
+    """
+    key = (url, tuple(sorted(params.items())))
+    response, shared = _flights.do(key, lambda: _request(url, params))
+    if shared:
+        _count("coalesced")
+        log.debug("Coalesced request to %s", url)
+    return response
+
+
+def cache_first():
+    """True when cached data should be served instead of refetching"""
+    remaining = quota.remaining()
+    if remaining is not None and remaining < OWM_DAILY_QUOTA * QUOTA_RESERVE:
+        return True
+    return limiter.available() < 1
+
+
+def usage():
+    """Today's call count and budget, plus this process's request counters"""
+    with _stats_lock:
+        stats = dict(_stats)
+    return {
+        "used_today": quota.used(),
+        "daily_quota": OWM_DAILY_QUOTA or None,
+        "rate_per_minute": OWM_RATE_PER_MINUTE,
+        **stats,
+    }
+
+
+def usage_summary():
+    """One-line usage text for the GUI and the CLI"""
+    info = usage()
+    text = f"API calls today: {info['used_today']}"
+    if info["daily_quota"]:
+        text += f" / {info['daily_quota']}"
+    if info["coalesced"]:
+        text += f" ({info['coalesced']} shared)"
+    return text
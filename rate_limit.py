@@ -0,0 +1,142 @@
+"""Client-side rate limiting for outbound API calls.
+
+RateLimiter paces requests, QuotaCounter tracks a daily call budget across
+runs, and SingleFlight lets concurrent identical requests share one call.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class RateLimiter:
+    """Token bucket allowing rate calls per second on average.
+
+    Up to burst calls can go out back to back after an idle period.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self):
+        """Tokens available right now (may be fractional)"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self):
+        """Take a token if one is available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class QuotaExceeded(RuntimeError):
+    """Raised instead of making a call once the daily quota is used up"""
+
+
+class QuotaCounter:
+    """Calls made per UTC day, persisted in the weather store.
+
+    The count lives in the store so the CLI and the GUI (and every run of
+    either) draw from the same budget.
+    """
+
+    def __init__(self, store, daily_limit):
+        self.store = store
+        self.daily_limit = daily_limit
+
+    @staticmethod
+    def today():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def used(self):
+        return self.store.api_calls(self.today())
+
+    def remaining(self):
+        """Calls left today, or None when there is no daily limit"""
+        if not self.daily_limit:
+            return None
+        return max(0, self.daily_limit - self.used())
+
+    def check(self):
+        """Raise QuotaExceeded if no calls are left today"""
+        if self.remaining() == 0:
+            raise QuotaExceeded(f"Daily API quota of {self.daily_limit} calls used up")
+
+    def record(self, calls=1):
+        self.store.add_api_calls(self.today(), calls)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait and get the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Return func(), shared with concurrent callers for key.
+
+        Returns (result, shared), where shared is True for callers that
+        waited on another caller's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,107 @@
+"""Periodic background refresh of the city on screen.
+
+OpenWeatherMap recalculates current conditions about every ten minutes, so
+refreshing more often only returns the same payload. The scheduler times
+each refresh to land just after the next expected update: the observation
+time ("dt") of the data on screen plus one interval, or the next interval
+boundary when that is unknown or already past. Failed refreshes back off
+exponentially. Nothing is fetched while the window is minimized; a refresh
+that came due in the meantime runs as soon as the window is shown again.
+
+Everything runs on the Tk event loop via root.after(); the refresh callback
+is expected to hand the network work to a FetchExecutor.
+"""
+import os
+import random
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds between refreshes; 0 turns auto-refresh off
+REFRESH_INTERVAL = float(os.getenv("WEATHER_REFRESH_INTERVAL", "600"))
+
+# Seconds after the expected provider update to refresh, so the new data
+# is actually there
+REFRESH_OFFSET = 30
+
+# Never refresh sooner than this many seconds after the last one
+MIN_DELAY = 60
+
+# Retry delay after the first failure, doubled per further failure
+ERROR_DELAY = 60
+MAX_ERROR_DELAY = 3600
+
+
+class RefreshScheduler:
+    """Calls refresh() on the Tk thread whenever the display is due an update.
+
+    refresh() must report back through start() (after a successful refresh,
+    whether or not the data changed) or failed().
+    """
+
+    def __init__(self, root, refresh, interval=REFRESH_INTERVAL, offset=REFRESH_OFFSET):
+        self.root = root
+        self.refresh = refresh
+        self.interval = interval
+        self.offset = offset
+        self.failures = 0
+        self._job = None
+        self._paused = False
+        root.bind("<Map>", self._on_map, add="+")
+
+    @property
+    def enabled(self):
+        return self.interval > 0
+
+    def next_delay(self, observed_at=None, now=None):
+        """Seconds until the refresh after data observed at observed_at"""
+        if now is None:
+            now = time.time()
+        target = None
+        if observed_at:
+            target = observed_at + self.interval + self.offset
+        if target is None or target < now + MIN_DELAY:
+            # Next interval boundary, e.g. :00, :10, :20 past the hour
+            target = now - (now % self.interval) + self.interval + self.offset
+            if target < now + MIN_DELAY:
+                target += self.interval
+        return target - now
+
+    def start(self, observed_at=None):
+        """(Re)schedule the next refresh after fresh data was shown"""
+        self.failures = 0
+        if self.enabled:
+            self._schedule(self.next_delay(observed_at))
+
+    def failed(self):
+        """Schedule a retry after a failed refresh, backing off each time"""
+        self.failures += 1
+        if self.enabled:
+            delay = min(ERROR_DELAY * 2 ** (self.failures - 1), MAX_ERROR_DELAY)
+            self._schedule(delay * random.uniform(0.8, 1.2))
+
+    def stop(self):
+        """Cancel the pending refresh, e.g. when nothing is displayed"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self._paused = False
+
+    def _schedule(self, delay):
+        self.stop()
+        self._job = self.root.after(int(delay * 1000), self._tick)
+
+    def _tick(self):
+        self._job = None
+        if self.root.state() in ("iconic", "withdrawn"):
+            # Minimized: wait for the window to come back
+            self._paused = True
+            return
+        self.refresh()
+
+    def _on_map(self, event):
+        if event.widget is self.root and self._paused:
+            self._paused = False
+            self.refresh()
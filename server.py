@@ -0,0 +1,321 @@
+"""Headless weather service: current weather and forecasts over HTTP/JSON.
+
+    python server.py                       # 127.0.0.1:8080
+    python server.py --host 0.0.0.0 --port 8080 --upstream 4
+
+Routes (GET):
+    /weather?city=NAME    current weather, weather_records.CurrentConditions fields
+    /forecast?city=NAME   {"days": [...]} daily forecast, ForecastDay fields
+    /stats                cache, coalescing and upstream counters
+    /health               {"status": "ok"}
+
+Every client shares the in-memory weather and forecast caches, so a city is
+fetched from OpenWeatherMap at most once per cache TTL however many clients
+ask for it. Requests for a city that is already being fetched wait for that
+fetch instead of starting another, and at most --upstream fetches run at
+once; each goes through owm_client, so the rate limit and daily quota apply
+as they do for the CLI and the GUI. Everything else (parsing requests,
+serving cached data) happens on one asyncio event loop, which keeps
+thousands of idle or waiting keep-alive connections cheap.
+
+Point the CLI and the GUI at a running service with WEATHER_SERVICE_URL.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+
+import owm_client
+import service_client
+from city_index import city_label, UnknownCity
+from rate_limit import QuotaExceeded
+from weather_cache import weather_cache, forecast_cache, normalize_city
+from weather_core import API_KEY, AsyncWeatherClient, OWMTransport, WeatherClient
+from weather_logging import get_logger
+
+load_dotenv()
+
+log = get_logger("server")
+
+SERVICE_HOST = os.getenv("WEATHER_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("WEATHER_SERVICE_PORT", "8080"))
+
+# OpenWeatherMap fetches in flight at once
+UPSTREAM_CONCURRENCY = int(os.getenv("WEATHER_SERVICE_UPSTREAM", "8"))
+
+# Seconds a client waits for a fetch before getting a 504; the fetch itself
+# carries on and fills the cache for the next request
+UPSTREAM_TIMEOUT = 30
+
+# Seconds an idle keep-alive connection is kept open
+KEEPALIVE_TIMEOUT = 15
+
+# Largest request head accepted, and pending connections the OS may queue
+MAX_HEAD_BYTES = 8192
+BACKLOG = 2048
+
+# Encoded response bodies kept for reuse, per route
+BODY_CACHE_SIZE = 1024
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+# route -> (cache, AsyncWeatherClient method, result field, response wrapper)
+LOOKUPS = {
+    "/weather": (weather_cache, "weather", "conditions", lambda conditions: conditions.to_dict()),
+    "/forecast": (forecast_cache, "forecast", "days",
+                  lambda days: {"days": [day.to_dict() for day in days]}),
+}
+
+
+def encode(payload):
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def error_response(err):
+    """Map a lookup failure to (status, body, extra headers)"""
+    if isinstance(err, UnknownCity):
+        return 404, {"error": str(err),
+                     "suggestions": [city_label(city) for city in err.suggestions]}, ()
+    if isinstance(err, QuotaExceeded):
+        return 503, {"error": str(err)}, (("Retry-After", "3600"),)
+    if isinstance(err, asyncio.TimeoutError):
+        return 504, {"error": "Timed out waiting for OpenWeatherMap"}, ()
+    # HTTPError from raise_for_status carries the upstream response
+    response = getattr(err, "response", None)
+    if response is not None:
+        if response.status_code == 404:
+            return 404, {"error": "City not found"}, ()
+        return 502, {"error": f"OpenWeatherMap returned HTTP {response.status_code}"}, ()
+    return 502, {"error": str(err) or type(err).__name__}, ()
+
+
+class WeatherService:
+    """Shared-cache lookups and the HTTP front end; run with serve()"""
+
+    def __init__(self, upstream_concurrency=UPSTREAM_CONCURRENCY,
+                 upstream_timeout=UPSTREAM_TIMEOUT):
+        self.upstream_concurrency = upstream_concurrency
+        self.upstream_timeout = upstream_timeout
+        # Always OpenWeatherMap itself, whatever WEATHER_SERVICE_URL says
+        self.client = AsyncWeatherClient(
+            WeatherClient(OWMTransport(), weather_cache, forecast_cache),
+            upstream_concurrency
+        )
+        self.connections = 0
+        self.counters = {"requests": 0, "cache_hits": 0, "coalesced": 0,
+                         "upstream_calls": 0, "upstream_errors": 0}
+        # (route, normalized city) -> fetch task in flight
+        self._inflight = {}
+        # (route, normalized city) -> (data, encoded body)
+        self._bodies = {}
+
+    async def lookup(self, route, city):
+        """Return (data, source) for city; source is hit, coalesced or miss"""
+        cache, method, field, _ = LOOKUPS[route]
+        data = cache.get(city)
+        if data is not None:
+            self.counters["cache_hits"] += 1
+            return data, "hit"
+
+        key = (route, normalize_city(city))
+        task = self._inflight.get(key)
+        source = "coalesced"
+        if task is None:
+            source = "miss"
+            task = asyncio.ensure_future(self._fetch(key, method, field, city))
+            # Nobody may be left waiting when it fails (they timed out)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            self.counters["coalesced"] += 1
+        # Shielded: a client that gives up does not cancel the shared fetch
+        data = await asyncio.wait_for(asyncio.shield(task), self.upstream_timeout)
+        return data, source
+
+    async def _fetch(self, key, method, field, city):
+        self.counters["upstream_calls"] += 1
+        try:
+            # lookup() has just missed the cache; probing it again would
+            # count a second miss
+            result = await getattr(self.client, method)(city, use_cache=False)
+            return getattr(result, field)
+        except Exception:
+            self.counters["upstream_errors"] += 1
+            raise
+        finally:
+            del self._inflight[key]
+
+    def body_for(self, route, city, data):
+        """The encoded response for data, reused while the cache returns it"""
+        key = (route, normalize_city(city))
+        cached = self._bodies.get(key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        body = encode(LOOKUPS[route][3](data))
+        if len(self._bodies) >= BODY_CACHE_SIZE:
+            self._bodies.clear()
+        self._bodies[key] = (data, body)
+        return body
+
+    def stats(self):
+        return {
+            **self.counters,
+            "connections": self.connections,
+            "inflight": len(self._inflight),
+            "upstream_concurrency": self.upstream_concurrency,
+            "weather_cache": weather_cache.stats(),
+            "forecast_cache": forecast_cache.stats(),
+            "api_usage": owm_client.usage(),
+        }
+
+    async def dispatch(self, method, target):
+        """Return (status, body bytes, extra headers) for one request"""
+        if method not in ("GET", "HEAD"):
+            return 405, encode({"error": "Only GET is supported"}), (("Allow", "GET, HEAD"),)
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        if path == "/health":
+            return 200, encode({"status": "ok"}), ()
+        if path == "/stats":
+            return 200, encode(self.stats()), ()
+        if path not in LOOKUPS:
+            return 404, encode({"error": f"Unknown route: {path}"}), ()
+
+        city = " ".join(parse_qs(url.query).get("city", [""])[0].split())
+        if not city:
+            return 400, encode({"error": "Missing ?city="}), ()
+        try:
+            data, source = await self.lookup(path, city)
+        except Exception as err:
+            status, payload, headers = error_response(err)
+            if status >= 500:
+                log.warning("%s for %s failed: %s", path, city, err)
+            return status, encode(payload), headers
+        return 200, self.body_for(path, city, data), (("X-Cache", source),)
+
+    async def handle(self, reader, writer):
+        """Serve one client connection, keeping it alive between requests"""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"),
+                                                  KEEPALIVE_TIMEOUT)
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, encode({"error": "Request too large"}),
+                                        keep_alive=False)
+                    return
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, encode({"error": "Bad request line"}),
+                                        keep_alive=False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                # No route takes a request body, so refuse one rather than
+                # read however much the client says it is sending
+                if (headers.get("content-length", "0").strip() not in ("", "0")
+                        or "transfer-encoding" in headers):
+                    await self._respond(writer, 413,
+                                        encode({"error": "Request bodies are not accepted"}),
+                                        keep_alive=False)
+                    return
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = (connection != "close" if version == "HTTP/1.1"
+                              else connection == "keep-alive")
+                self.counters["requests"] += 1
+                try:
+                    status, body, extra = await self.dispatch(method, target)
+                except Exception:
+                    log.exception("Error handling %s %s", method, target)
+                    status, body, extra = 500, encode({"error": "Internal error"}), ()
+                await self._respond(writer, status, body, extra, keep_alive,
+                                    head_only=method == "HEAD")
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down with the connection open
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _respond(self, writer, status, body, extra=(), keep_alive=True, head_only=False):
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in extra)
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, ready=None):
+        """Serve until cancelled; ready(server), if given, is called once listening"""
+        server = await asyncio.start_server(self.handle, host, port,
+                                            limit=MAX_HEAD_BYTES, backlog=BACKLOG)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.client.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve weather lookups over HTTP/JSON.")
+    parser.add_argument("--host", default=SERVICE_HOST,
+                        help=f"address to listen on (default {SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT,
+                        help=f"port to listen on (default {SERVICE_PORT})")
+    parser.add_argument("--upstream", type=int, default=UPSTREAM_CONCURRENCY,
+                        help=f"OpenWeatherMap fetches in flight at once (default {UPSTREAM_CONCURRENCY})")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if not API_KEY:
+        sys.exit("API key not found. Check your .env file.")
+    if service_client.enabled():
+        # The service always calls OpenWeatherMap itself
+        log.warning("Ignoring WEATHER_SERVICE_URL=%s in the service", service_client.SERVICE_URL)
+
+    service = WeatherService(args.upstream)
+
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Weather service on http://{address[0]}:{address[1]} "
+              f"(upstream concurrency {args.upstream})")
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
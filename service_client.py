@@ -0,0 +1,72 @@
+"""Client for a shared weather service (server.py).
+
+When WEATHER_SERVICE_URL is set, the CLI, the GUI and the dashboard ask
+that service for current weather and forecasts instead of calling
+OpenWeatherMap themselves, so every machine pointed at it shares one cache
+and one API budget.
+
+Each call is made once. The service has already retried OpenWeatherMap
+and classified the failure, so its error responses are final: 503 (daily
+quota used up) is raised as rate_limit.QuotaExceeded, and anything else as
+ServiceError carrying the service's message and the response (404 for an
+unknown city, 502/504 when the service could not reach OpenWeatherMap).
+"""
+import os
+
+from dotenv import load_dotenv
+
+import http_client
+import tracing
+from rate_limit import QuotaExceeded
+
+load_dotenv()
+
+# Base URL of the service, e.g. http://weather-box:8080; unset to call the
+# API directly
+SERVICE_URL = os.getenv("WEATHER_SERVICE_URL", "").rstrip("/") or None
+
+# (connect, read) timeouts; the read timeout outlasts the service's own
+# 30 second wait for OpenWeatherMap (server.UPSTREAM_TIMEOUT)
+SERVICE_TIMEOUT = (3.05, 35)
+
+
+class ServiceError(RuntimeError):
+    """An error response from the service; str() is its message"""
+
+    def __init__(self, message, response):
+        super().__init__(message)
+        self.response = response
+
+
+def enabled():
+    return SERVICE_URL is not None
+
+
+def _raise_for_status(response):
+    if response.status_code < 400:
+        return
+    try:
+        message = response.json()["error"]
+    except (ValueError, KeyError, TypeError):
+        message = f"Weather service returned HTTP {response.status_code}"
+    if response.status_code == 503:
+        raise QuotaExceeded(message)
+    raise ServiceError(message, response)
+
+
+def _get(path, city):
+    response = http_client.get(f"{SERVICE_URL}{path}", params={"city": city},
+                               timeout=SERVICE_TIMEOUT, max_attempts=1)
+    _raise_for_status(response)
+    with tracing.span("json.decode", "parse"):
+        return response.json()
+
+
+def weather(city):
+    """Current weather for city, as a CurrentConditions dict"""
+    return _get("/weather", city)
+
+
+def forecast(city):
+    """Daily forecast for city, as a list of ForecastDay dicts"""
+    return _get("/forecast", city)["days"]
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from city_index import City, CityIndex, UnknownCity, city_label, index_key
+
+CITIES = [
+    City("London", "GB", 2643743),
+    City("London", "CA", 6058560),
+    City("Paris", "FR", 2988507),
+    City("Berlin", "DE", 2950159),
+    City("São Paulo", "BR", 3448439),
+    City("Lisbon", "PT", 2267057),
+]
+
+
+def write_index(path, cities):
+    lines = sorted(f"{index_key(c.name)}\t{c.name}\t{c.country}\t{c.id}" for c in cities)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class CityIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "cities.idx")
+        write_index(path, CITIES)
+        self.index = CityIndex(path)
+
+    def test_exact_lookup_folds_case_accents_and_spacing(self):
+        self.assertEqual(self.index.lookup("  sao   PAULO "), [City("São Paulo", "BR", 3448439)])
+        self.assertEqual(self.index.lookup("Berlin"), [City("Berlin", "DE", 2950159)])
+        self.assertEqual(self.index.lookup("Atlantis"), [])
+
+    def test_country_narrows_a_shared_name(self):
+        self.assertEqual(len(self.index.lookup("London")), 2)
+        self.assertEqual(self.index.lookup("London, ca"), [City("London", "CA", 6058560)])
+        self.assertIsNone(self.index.resolve("London"))
+        self.assertEqual(self.index.resolve("London, GB").id, 2643743)
+
+    def test_complete(self):
+        self.assertEqual([c.name for c in self.index.complete("li")], ["Lisbon"])
+        self.assertEqual(self.index.complete(""), [])
+
+    def test_fuzzy_correction(self):
+        self.assertEqual(self.index.correct("Berlni"), [City("Berlin", "DE", 2950159)])
+        self.assertEqual(self.index.correct("Lodnon, GB"), [City("London", "GB", 2643743)])
+        self.assertEqual(self.index.correct("Be"), [])
+
+    def test_check(self):
+        self.assertEqual(self.index.check("Paris").id, 2988507)
+        # Ambiguous: left to the API
+        self.assertIsNone(self.index.check("London"))
+        # Unknown and close to nothing in the index: sent as typed
+        self.assertIsNone(self.index.check("Portland, OR, US"))
+
+    def test_check_raises_unknown_city_with_suggestions(self):
+        with self.assertRaises(UnknownCity) as caught:
+            self.index.check("Pariss")
+        self.assertEqual(caught.exception.query, "Pariss")
+        self.assertEqual(caught.exception.suggestions, [City("Paris", "FR", 2988507)])
+        self.assertIn("did you mean Paris, FR?", str(caught.exception))
+
+    def test_missing_index_knows_nothing(self):
+        index = CityIndex(os.path.join(os.path.dirname(self.index.path), "missing.idx"))
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.check("Pariss"))
+
+    def test_city_label(self):
+        self.assertEqual(city_label(City("London", "GB", 1)), "London, GB")
+        self.assertEqual(city_label(City("Nowhere", "", 2)), "Nowhere")
+
+
+if __name__ == "__main__":
+    unittest.main()
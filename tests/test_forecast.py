@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime, timezone
+
+from forecast import aggregate
+
+# 2024-05-30 00:00 UTC
+MIDNIGHT = int(datetime(2024, 5, 30, tzinfo=timezone.utc).timestamp())
+HOUR = 3600
+
+
+def slot(hours, temp, icon="01d", description="clear sky", rain=None, snow=None):
+    entry = {
+        "dt": MIDNIGHT + hours * HOUR,
+        "main": {"temp": temp},
+        "weather": [{"icon": icon, "description": description}],
+    }
+    if rain is not None:
+        entry["rain"] = {"3h": rain}
+    if snow is not None:
+        entry["snow"] = {"3h": snow}
+    return entry
+
+
+class AggregateTest(unittest.TestCase):
+    def test_daily_statistics(self):
+        payload = {"list": [
+            slot(0, 10.0, rain=1.0),
+            slot(3, 14.0, icon="10d", description="light rain", rain=0.5),
+            slot(6, 12.0, snow=0.25),
+            slot(24, 20.0, icon="02d", description="few clouds"),
+        ]}
+        hourly, daily = aggregate(payload)
+
+        self.assertEqual(len(hourly), 4)
+        self.assertEqual(list(hourly.precipitation), [1.0, 0.5, 0.25, 0.0])
+        self.assertEqual(len(daily), 2)
+        self.assertEqual(list(daily.temp_min), [10.0, 20.0])
+        self.assertEqual(list(daily.temp_max), [14.0, 20.0])
+        self.assertEqual(list(daily.temp_mean), [12.0, 20.0])
+        self.assertEqual(list(daily.precipitation), [1.75, 0.0])
+        self.assertEqual(daily.icons, ["01d", "02d"])
+        self.assertEqual(daily.descriptions, ["clear sky", "few clouds"])
+
+    def test_dominant_icon_earliest_wins_a_tie(self):
+        payload = {"list": [
+            slot(0, 10.0, icon="04d", description="broken clouds"),
+            slot(3, 10.0, icon="10d", description="light rain"),
+            slot(6, 10.0, icon="10d", description="moderate rain"),
+            slot(9, 10.0, icon="04d", description="overcast clouds"),
+        ]}
+        _, daily = aggregate(payload)
+        self.assertEqual(daily.icons, ["04d"])
+        # The description comes from the icon's first slot
+        self.assertEqual(daily.descriptions, ["broken clouds"])
+
+    def test_days_follow_the_city_timezone(self):
+        # 22:00 and 23:00 UTC on the 30th are already the 31st at UTC+3
+        payload = {"city": {"timezone": 3 * HOUR},
+                   "list": [slot(18, 10.0), slot(22, 12.0), slot(23, 14.0)]}
+        _, daily = aggregate(payload)
+        self.assertEqual([daily.label(i) for i in range(len(daily))],
+                         ["Thu, 30 May", "Fri, 31 May"])
+        self.assertEqual(list(daily.temp_max), [10.0, 14.0])
+
+    def test_slots_without_time_or_temperature_are_skipped(self):
+        payload = {"list": [{"main": {"temp": 5.0}}, {"dt": MIDNIGHT}, slot(0, 8.0)]}
+        hourly, daily = aggregate(payload)
+        self.assertEqual(len(hourly), 1)
+        self.assertEqual(list(daily.temp_mean), [8.0])
+
+    def test_empty_payload(self):
+        hourly, daily = aggregate({})
+        self.assertEqual((len(hourly), len(daily)), (0, 0))
+        self.assertEqual(daily.records(), [])
+
+    def test_records_limit(self):
+        payload = {"list": [slot(24 * day, 10.0 + day) for day in range(7)]}
+        _, daily = aggregate(payload)
+        days = daily.records(limit=5)
+        self.assertEqual(len(days), 5)
+        self.assertEqual(days[0].date, "Thu, 30 May")
+        self.assertEqual(days[4].temp_max, 14.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
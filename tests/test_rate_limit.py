@@ -0,0 +1,134 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from rate_limit import QuotaCounter, QuotaExceeded, RateLimiter, SingleFlight
+from weather_store import WeatherStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("rate_limit.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+    def test_burst_then_empty(self):
+        limiter = RateLimiter(2, burst=3)
+        self.assertEqual([limiter.try_acquire() for _ in range(4)], [True, True, True, False])
+
+    def test_refills_at_rate_up_to_burst(self):
+        limiter = RateLimiter(2, burst=3)
+        for _ in range(3):
+            limiter.try_acquire()
+        self.clock.now += 0.5
+        self.assertAlmostEqual(limiter.available(), 1.0)
+        self.clock.now += 60
+        self.assertAlmostEqual(limiter.available(), 3.0)
+
+    def test_acquire_sleeps_for_the_missing_fraction(self):
+        limiter = RateLimiter(4, burst=1)
+        limiter.acquire()
+
+        def sleep(seconds):
+            self.clock.now += seconds
+
+        with mock.patch("rate_limit.time.sleep", side_effect=sleep) as fake_sleep:
+            limiter.acquire()
+        fake_sleep.assert_called_once()
+        self.assertAlmostEqual(fake_sleep.call_args[0][0], 0.25)
+
+
+class QuotaCounterTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = WeatherStore(os.path.join(tmp.name, "store.db"))
+
+    def test_counts_against_the_daily_limit(self):
+        quota = QuotaCounter(self.store, 3)
+        quota.record()
+        quota.record(2)
+        self.assertEqual(quota.used(), 3)
+        self.assertEqual(quota.remaining(), 0)
+        with self.assertRaises(QuotaExceeded):
+            quota.check()
+
+    def test_shared_through_the_store(self):
+        QuotaCounter(self.store, 10).record(4)
+        self.assertEqual(QuotaCounter(self.store, 10).remaining(), 6)
+
+    def test_new_day_starts_from_zero(self):
+        quota = QuotaCounter(self.store, 5)
+        with mock.patch.object(QuotaCounter, "today", return_value="2024-01-01"):
+            quota.record(5)
+        with mock.patch.object(QuotaCounter, "today", return_value="2024-01-02"):
+            self.assertEqual(quota.remaining(), 5)
+            quota.check()
+
+    def test_no_limit(self):
+        quota = QuotaCounter(self.store, 0)
+        quota.record(100)
+        self.assertIsNone(quota.remaining())
+        quota.check()
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+                     for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        # Give the followers time to join the call before it finishes
+        time.sleep(0.1)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [("result", False)] + [("result", True)] * 3)
+
+    def test_failed_call_releases_the_key(self):
+        flights = SingleFlight()
+        with self.assertRaises(KeyError):
+            flights.do("k", lambda: {}["missing"])
+        self.assertEqual(flights.do("k", lambda: 1), (1, False))
+
+    def test_sequential_calls_are_not_shared(self):
+        flights = SingleFlight()
+        self.assertEqual(flights.do("k", lambda: 1), (1, False))
+        self.assertEqual(flights.do("k", lambda: 2), (2, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
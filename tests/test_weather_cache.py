@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+from weather_cache import TTLCache, normalize_city
+
+
+class TTLCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("weather_cache.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalize_city(self):
+        self.assertEqual(normalize_city("  new   YORK "), "new york")
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(60)
+        cache.set("London", 1)
+        self.assertEqual(cache.get(" london "), 1)
+        self.assertIsNone(cache.get("Paris"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(60)
+        cache.set("London", 1)
+        self.now += 59
+        self.assertEqual(cache.get("London"), 1)
+        self.now += 2
+        self.assertIsNone(cache.get("London"))
+        self.assertEqual(len(cache), 0)
+
+    def test_set_restarts_the_ttl(self):
+        cache = TTLCache(60)
+        cache.set("London", 1)
+        self.now += 50
+        cache.set("London", 2)
+        self.now += 50
+        self.assertEqual(cache.get("London"), 2)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(60, maxsize=2)
+        cache.set("London", 1)
+        cache.set("Paris", 2)
+        cache.get("London")
+        cache.set("Berlin", 3)
+        self.assertIsNone(cache.get("Paris"))
+        self.assertEqual(cache.get("London"), 1)
+        self.assertEqual(cache.get("Berlin"), 3)
+
+    def test_invalidate_and_clear(self):
+        cache = TTLCache(60)
+        cache.set("London", 1)
+        cache.set("Paris", 2)
+        cache.invalidate("LONDON")
+        self.assertIsNone(cache.get("London"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
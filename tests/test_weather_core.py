@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+
+from city_index import UnknownCity
+from weather_cache import TTLCache
+from weather_core import (CACHE, NETWORK, SAVED, WeatherClient, describe_error,
+                          is_not_found)
+from weather_records import CurrentConditions, ForecastDay
+from weather_store import WeatherStore
+
+
+def conditions(temp=14.5, name="London"):
+    return CurrentConditions(2643743, name, 1717069200, temp, 13.9, 12.0, 16.0,
+                             74, 4.6, "04d", "broken clouds")
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code)
+
+
+class FakeTransport:
+    """Serves canned records, or raises error, counting the calls"""
+
+    def __init__(self):
+        self.current_value = conditions()
+        self.forecast_value = [ForecastDay("Thu, 30 May", 12.0, 18.0, 15.0, 0.4,
+                                           "10d", "light rain")]
+        self.error = None
+        self.tight = False
+        self.calls = 0
+
+    def prefer_cache(self):
+        return self.tight
+
+    def current(self, city):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.current_value
+
+    def forecast(self, city):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.forecast_value
+
+
+class WeatherClientTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = WeatherStore(os.path.join(self.tmp.name, "store.db"))
+        self.transport = FakeTransport()
+        self.client = WeatherClient(self.transport, TTLCache(60), TTLCache(60), self.store)
+
+    def test_network_then_cache_hit(self):
+        first = self.client.weather("London")
+        second = self.client.weather("  LONDON ")
+        self.assertEqual(first.source, NETWORK)
+        self.assertIsNotNone(first.fetched_at)
+        self.assertEqual(second.source, CACHE)
+        self.assertEqual(second.conditions, first.conditions)
+        self.assertEqual(self.transport.calls, 1)
+
+    def test_use_cache_false_refetches(self):
+        self.client.weather("London")
+        self.client.weather("London", use_cache=False)
+        self.assertEqual(self.transport.calls, 2)
+
+    def test_tight_budget_serves_cache_even_when_refetching(self):
+        self.client.weather("London")
+        self.transport.tight = True
+        result = self.client.weather("London", use_cache=False)
+        self.assertEqual(result.source, CACHE)
+        self.assertEqual(self.transport.calls, 1)
+
+    def test_fallback_serves_saved_copy_as_stale(self):
+        saved = self.client.weather("London")
+        self.transport.error = OSError("offline")
+        result = self.client.weather("London", use_cache=False, fallback=True)
+        self.assertEqual(result.source, SAVED)
+        self.assertTrue(result.stale)
+        self.assertIs(result.error, self.transport.error)
+        self.assertEqual(result.conditions, saved.conditions)
+        self.assertIsNotNone(result.fetched_at)
+
+    def test_forecast_fallback_round_trips_through_store(self):
+        fetched = self.client.forecast("London")
+        self.transport.error = OSError("offline")
+        result = self.client.forecast("London", use_cache=False, fallback=True)
+        self.assertTrue(result.stale)
+        self.assertEqual(result.days, fetched.days)
+
+    def test_without_fallback_the_error_is_raised(self):
+        self.client.weather("London")
+        self.transport.error = OSError("offline")
+        with self.assertRaises(OSError):
+            self.client.weather("London", use_cache=False)
+
+    def test_fallback_raises_when_nothing_saved(self):
+        self.transport.error = OSError("offline")
+        with self.assertRaises(OSError):
+            self.client.weather("Paris", fallback=True)
+
+    def test_not_found_never_falls_back(self):
+        self.client.weather("London")
+        for error in (UnknownCity("London"), FakeHTTPError(404)):
+            self.transport.error = error
+            with self.assertRaises(type(error)):
+                self.client.weather("London", use_cache=False, fallback=True)
+
+    def test_remember_weather_saves_city_id(self):
+        self.client.weather("London")
+        self.assertEqual(self.store.city_ids(["london"]), {"london": 2643743})
+
+    def test_no_cache_or_store(self):
+        client = WeatherClient(self.transport, None, None, None)
+        client.weather("London")
+        client.weather("London")
+        self.assertEqual(self.transport.calls, 2)
+        self.transport.error = OSError("offline")
+        with self.assertRaises(OSError):
+            client.weather("London", fallback=True)
+
+
+class ErrorTest(unittest.TestCase):
+    def test_is_not_found(self):
+        self.assertTrue(is_not_found(UnknownCity("Atlantis")))
+        self.assertTrue(is_not_found(FakeHTTPError(404)))
+        self.assertFalse(is_not_found(FakeHTTPError(500)))
+        self.assertFalse(is_not_found(OSError("offline")))
+
+    def test_describe_error(self):
+        self.assertEqual(describe_error(FakeHTTPError(404)), "City not found")
+        self.assertEqual(describe_error(FakeHTTPError(502)), "HTTP 502")
+        self.assertEqual(describe_error(OSError("offline")), "offline")
+        self.assertEqual(describe_error(TimeoutError()), "TimeoutError")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import unittest
+
+from weather_records import CurrentConditions, ForecastDay
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "benchmarks", "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class CurrentConditionsTest(unittest.TestCase):
+    def test_from_payload_keeps_the_displayed_fields(self):
+        record = CurrentConditions.from_payload(load_fixture("weather.json"))
+        self.assertEqual(record, CurrentConditions(
+            2643743, "London", 1717069200, 14.62, 14.03, 13.36, 15.71,
+            74, 4.63, "04d", "broken clouds"))
+
+    def test_dict_round_trip_through_json(self):
+        record = CurrentConditions.from_payload(load_fixture("weather.json"))
+        data = json.loads(json.dumps(record.to_dict()))
+        self.assertEqual(CurrentConditions.from_dict(data), record)
+
+    def test_from_dict_accepts_a_raw_payload(self):
+        payload = load_fixture("weather.json")
+        self.assertEqual(CurrentConditions.from_dict(payload),
+                         CurrentConditions.from_payload(payload))
+
+    def test_sparse_payload(self):
+        record = CurrentConditions.from_payload({"main": {"temp": 3.5}})
+        self.assertEqual((record.feels_like, record.temp_min, record.temp_max), (3.5, 3.5, 3.5))
+        self.assertEqual((record.icon, record.description), ("", ""))
+        self.assertIsNone(record.wind_speed)
+
+    def test_records_have_no_instance_dict(self):
+        record = CurrentConditions.from_payload(load_fixture("weather.json"))
+        self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(TypeError):
+            hash(record)
+
+
+class ForecastDayTest(unittest.TestCase):
+    def test_dict_round_trip(self):
+        day = ForecastDay("Thu, 30 May", 12.0, 18.5, 15.25, 0.4, "10d", "light rain")
+        self.assertEqual(ForecastDay.from_dict(json.loads(json.dumps(day.to_dict()))), day)
+        self.assertNotEqual(day, ForecastDay("Thu, 30 May", 12.0, 18.5, 15.25, 0.4,
+                                             "10d", "moderate rain"))
+
+    def test_from_dict_accepts_older_saved_days(self):
+        # With daily min/max and "weather" for the description
+        day = ForecastDay.from_dict({"date": "Thu, 30 May", "temp": 18.5, "temp_min": 12.0,
+                                     "temp_max": 18.5, "temp_mean": 15.25,
+                                     "precipitation": 0.4, "icon": "10d",
+                                     "weather": "light rain"})
+        self.assertEqual(day.description, "light rain")
+        self.assertEqual(day.temp_min, 12.0)
+        # The oldest: a single temperature for the day
+        day = ForecastDay.from_dict({"date": "Thu, 30 May", "temp": 17.0, "icon": "01d",
+                                     "weather": "clear sky"})
+        self.assertEqual((day.temp_min, day.temp_max, day.temp_mean), (17.0, 17.0, 17.0))
+        self.assertEqual(day.precipitation, 0.0)
+
+    def test_repeated_strings_are_shared(self):
+        first = ForecastDay("".join(["Thu, ", "30 May"]), 1.0, 2.0, 1.5, 0.0,
+                            "".join(["10", "d"]), "light rain")
+        second = ForecastDay("Thu, 30 May", 1.0, 2.0, 1.5, 0.0, "10d", "light rain")
+        self.assertIs(first.date, second.date)
+        self.assertIs(first.icon, second.icon)
+
+
+if __name__ == "__main__":
+    unittest.main()
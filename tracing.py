@@ -0,0 +1,249 @@
+"""Per-stage timing of lookups: network, parsing, icons and rendering.
+
+Code marks the stages of its hot paths with spans:
+
+    with tracing.span("json.decode", "parse"):
+        data = response.json()
+
+While tracing is off (the default) span() returns a shared do-nothing
+context manager, so an instrumented stage costs one flag check. While it is
+on, each span records its start, duration and thread into a bounded
+in-memory buffer, from which a per-stage breakdown can be printed and a
+Chrome trace file (chrome://tracing, https://ui.perfetto.dev) exported.
+
+Work that starts on one thread and finishes on another, like a GUI search,
+is timed with begin() ... end(); the operation's report() breaks its time
+down into the spans recorded while it ran.
+
+Configuration (environment or .env):
+    WEATHER_TRACE       set to 1 to trace from startup
+    WEATHER_TRACE_FILE  Chrome trace written here at exit (implies WEATHER_TRACE)
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TRACE = os.getenv("WEATHER_TRACE", "").lower() in ("1", "true", "yes", "on")
+TRACE_FILE = os.getenv("WEATHER_TRACE_FILE")
+
+# Spans kept in memory; the oldest are dropped beyond this
+MAX_EVENTS = 100_000
+
+_enabled = False
+_export_paths = set()
+_origin = time.perf_counter_ns()
+_pid = os.getpid()
+
+# (name, category, start_ns, duration_ns, thread_id, args)
+_events = deque(maxlen=MAX_EVENTS)
+_thread_names = {}
+
+
+def enabled():
+    return _enabled
+
+
+def enable(path=None):
+    """Start recording spans; with a path, write a Chrome trace there at exit"""
+    global _enabled
+    _enabled = True
+    if path and path not in _export_paths:
+        _export_paths.add(path)
+        atexit.register(export, path)
+
+
+def disable():
+    """Stop recording; spans already recorded are kept"""
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    _events.clear()
+
+
+def _record(name, cat, start, duration, args):
+    thread = threading.current_thread()
+    _thread_names[thread.ident] = thread.name
+    _events.append((name, cat, start, duration, thread.ident, args))
+
+
+class _NullSpan:
+    """Stands in for every span while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter_ns() - self.start
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record(self.name, self.cat, self.start, duration, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach details learned inside the span, e.g. an HTTP status"""
+        self.args.update(args)
+
+
+def span(name, cat="app", **args):
+    """Context manager timing one stage; args are shown with the span"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+class _NullOperation:
+    __slots__ = ()
+
+    def end(self, **args):
+        return None
+
+    def report(self):
+        return ""
+
+
+_NULL_OPERATION = _NullOperation()
+
+
+class Operation:
+    """A traced piece of work that may end on a different thread"""
+
+    __slots__ = ("name", "args", "start", "duration", "stages")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = time.perf_counter_ns()
+        self.duration = None
+        self.stages = []
+
+    def end(self, **args):
+        """Record the operation; returns its duration in ms"""
+        if self.duration is None:
+            self.duration = time.perf_counter_ns() - self.start
+            self.args.update(args)
+            self.stages = breakdown(self.start, self.start + self.duration)
+            _record(self.name, "operation", self.start, self.duration, self.args)
+        return self.duration / 1e6
+
+    def report(self):
+        """Multi-line breakdown of the operation into its stages"""
+        if self.duration is None:
+            return ""
+        label = " ".join(str(value) for value in self.args.values())
+        return format_breakdown(self.stages, f"{self.name} {label}".strip(),
+                                self.duration / 1e6)
+
+
+def begin(name, **args):
+    """Start timing an operation; call end() on the result when it is done"""
+    if not _enabled:
+        return _NULL_OPERATION
+    return Operation(name, args)
+
+
+def breakdown(start_ns=None, end_ns=None):
+    """Per-stage totals of the spans recorded between two perf_counter_ns times.
+
+    Returns (name, count, total_ms, max_ms) tuples in order of first start.
+    Spans on different threads overlap, so totals can add up to more than
+    the wall time.
+    """
+    rows = {}
+    for name, cat, start, duration, tid, args in _events.copy():
+        if cat == "operation":
+            continue
+        if start_ns is not None and start < start_ns:
+            continue
+        if end_ns is not None and start + duration > end_ns:
+            continue
+        row = rows.get(name)
+        if row is None:
+            rows[name] = [start, 1, duration, duration]
+        else:
+            row[1] += 1
+            row[2] += duration
+            row[3] = max(row[3], duration)
+    ordered = sorted(rows.items(), key=lambda item: item[1][0])
+    return [(name, count, total / 1e6, longest / 1e6)
+            for name, (first, count, total, longest) in ordered]
+
+
+def format_breakdown(rows, title=None, total_ms=None):
+    lines = []
+    if title is not None:
+        lines.append(f"{title}: {total_ms:.1f} ms" if total_ms is not None else title)
+    for name, count, total, longest in rows:
+        line = f"  {name:<20}{total:>9.1f} ms"
+        if count > 1:
+            line += f"  ({count}x, max {longest:.1f})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def summary():
+    """Breakdown of everything recorded so far"""
+    events = _events.copy()
+    if not events:
+        return "No spans recorded"
+    first = min(event[2] for event in events)
+    last = max(event[2] + event[3] for event in events)
+    return format_breakdown(breakdown(), f"Traced {len(events)} spans",
+                            (last - first) / 1e6)
+
+
+def export(path):
+    """Write the recorded spans as Chrome trace event JSON"""
+    trace_events = [
+        {"name": "thread_name", "ph": "M", "pid": _pid, "tid": tid, "args": {"name": name}}
+        for tid, name in list(_thread_names.items())
+    ]
+    for name, cat, start, duration, tid, args in _events.copy():
+        trace_events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - _origin) / 1000,
+            "dur": duration / 1000,
+            "pid": _pid,
+            "tid": tid,
+            "args": args,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+if TRACE or TRACE_FILE:
+    enable(TRACE_FILE)
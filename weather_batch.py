@@ -0,0 +1,155 @@
+"""Current weather for many cities with as few OpenWeatherMap requests as possible.
+
+A city's ID comes from the offline city index when it has one. Otherwise
+the first lookup goes through /weather by name, and the city ID in the
+response is remembered in the on-disk store. After that the city is
+fetched by ID through the /group endpoint, up to GROUP_LIMIT cities per
+request, and each response is fanned back out to the cities that asked for
+it. N known cities therefore cost about N / GROUP_LIMIT round trips.
+
+Every request goes through owm_client, so it counts against the shared
+OpenWeatherMap rate limit and daily quota. The optional limiter arguments
+add a further, caller-specific pace on top (e.g. main.py --rate).
+
+Single lookups go through weather_core's shared client. When it talks to
+a weather service instead of OpenWeatherMap, every city is asked for on its
+own; the service does its own caching and coalescing.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+import owm_client
+import tracing
+from city_index import city_index
+from weather_cache import weather_cache, normalize_city
+from weather_core import OWMTransport, weather_client
+from weather_logging import get_logger
+from weather_records import CurrentConditions
+from weather_store import store
+
+load_dotenv()
+
+log = get_logger(__name__)
+API_KEY = os.getenv("WEATHER_API_KEY")
+
+GROUP_URL = f"{owm_client.API_BASE}/group"
+
+# Most city IDs the group endpoint accepts per request
+GROUP_LIMIT = 20
+
+
+def _remember(city, conditions):
+    weather_client.remember_weather(city, conditions)
+
+
+def fetch_weather(city, limiter=None, use_cache=True):
+    """Return current weather for city as a CurrentConditions, cached when possible.
+
+    Raises requests exceptions on failure, or UnknownCity without making a
+    request when the offline city index has no such city. limiter, if given,
+    is only consulted when a network request is actually needed.
+    use_cache=False refetches unless the API budget is tight.
+    """
+    return weather_client.weather(city, use_cache, limiter=limiter).conditions
+
+
+def fetch_group(city_ids, limiter=None):
+    """Fetch up to GROUP_LIMIT cities by ID; returns {city_id: CurrentConditions}"""
+    params = {
+        "id": ",".join(str(city_id) for city_id in city_ids),
+        "appid": API_KEY,
+        "units": "metric"
+    }
+    if limiter is not None:
+        limiter.acquire()
+    response = owm_client.get(GROUP_URL, params)
+    response.raise_for_status()
+    with tracing.span("json.decode", "parse"):
+        entries = response.json().get("list", [])
+    with tracing.span("records.parse", "parse", cities=len(entries)):
+        return {entry["id"]: CurrentConditions.from_payload(entry) for entry in entries}
+
+
+def iter_weather(cities, concurrency=8, limiter=None, use_cache=True):
+    """Yield (city, conditions, error) for each distinct city as its lookup completes.
+
+    Cities equal after case/whitespace folding are looked up once and
+    yielded once, under the first spelling seen. error is the exception
+    raised for that city, or None; conditions is a CurrentConditions, or
+    None on error. With use_cache=False every city is fetched again, as
+    for a refresh.
+    """
+    pending = {}
+    for city in cities:
+        key = normalize_city(city)
+        if key in pending:
+            continue
+        data = weather_cache.get(city) if use_cache else None
+        if data is not None:
+            pending[key] = None
+            yield city, data, None
+        else:
+            pending[key] = city
+    pending = {key: city for key, city in pending.items() if city is not None}
+
+    # Only OpenWeatherMap itself has the group endpoint
+    batched = isinstance(weather_client.transport, OWMTransport)
+    known_ids = store.city_ids(pending) if batched else {}
+    by_id = {}
+    unknown = []
+    for key, city in pending.items():
+        city_id = known_ids.get(key)
+        if city_id is None and batched:
+            # Not looked up before, but the offline index may know its ID
+            try:
+                match = city_index.check(city)
+            except LookupError:
+                match = None
+            city_id = match.id if match is not None else None
+        if city_id is not None:
+            by_id.setdefault(city_id, []).append(city)
+        else:
+            unknown.append(city)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {}
+        ids = list(by_id)
+        for i in range(0, len(ids), GROUP_LIMIT):
+            chunk = ids[i:i + GROUP_LIMIT]
+            futures[pool.submit(fetch_group, chunk, limiter)] = chunk
+        for city in unknown:
+            futures[pool.submit(fetch_weather, city, limiter, use_cache)] = city
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                request = futures.pop(future)
+                if isinstance(request, str):
+                    try:
+                        yield request, future.result(), None
+                    except Exception as err:
+                        yield request, None, err
+                    continue
+
+                try:
+                    results = future.result()
+                except Exception as err:
+                    # owm_client has already retried; asking for each city
+                    # by name would only multiply the failing requests
+                    log.warning("Group lookup of %d cities failed: %s", len(request), err)
+                    for city_id in request:
+                        for city in by_id[city_id]:
+                            yield city, None, err
+                    continue
+                for city_id in request:
+                    data = results.get(city_id)
+                    for city in by_id[city_id]:
+                        if data is None:
+                            # Left out of the group response (e.g. a stale
+                            # ID): look it up by name instead
+                            futures[pool.submit(fetch_weather, city, limiter, use_cache)] = city
+                        else:
+                            _remember(city, data)
+                            yield city, data, None
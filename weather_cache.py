@@ -0,0 +1,81 @@
+"""In-memory response cache for weather lookups.
+
+Entries are keyed on the normalized city name and expire after a TTL. The
+least recently used entry is evicted once the cache is full.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds before cached current conditions / forecasts are refetched
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+FORECAST_CACHE_TTL = float(os.getenv("FORECAST_CACHE_TTL", "1800"))
+
+# Maximum number of cities kept per cache
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "128"))
+
+
+def normalize_city(city):
+    """Fold case and whitespace so "  new   YORK " and "New York" share an entry"""
+    return " ".join(city.split()).casefold()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl, maxsize=128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, city):
+        """Return the cached value for city, or None if missing or expired"""
+        key = normalize_city(city)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, city, value):
+        key = normalize_city(city)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, city):
+        with self._lock:
+            self._entries.pop(normalize_city(city), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared caches used by both the CLI and the GUI
+weather_cache = TTLCache(WEATHER_CACHE_TTL, WEATHER_CACHE_SIZE)
+forecast_cache = TTLCache(FORECAST_CACHE_TTL, WEATHER_CACHE_SIZE)
@@ -0,0 +1,320 @@
+"""UI-independent weather lookups shared by the CLI, the GUI and the service.
+
+WeatherClient looks up current weather and forecasts and returns result
+objects. It never prints or shows dialogs: callers decide how to present a
+result, and describe_error() turns a failure into a one-line message. A
+lookup
+
+1. serves the cache when allowed, and always when the transport says the
+   API budget is tight;
+2. otherwise fetches through the transport and remembers the result in the
+   cache and the on-disk store;
+3. with fallback=True, serves the last saved copy from the store when the
+   fetch fails for any reason other than an unknown city.
+
+Results carry weather_records: a CurrentConditions and a list of
+ForecastDay, parsed once when the response arrives. The caches hold the
+same records and the store saves them as dicts.
+
+Transports and caches are pluggable. A transport has current(city) and
+forecast(city), which return a CurrentConditions and a list of ForecastDay
+(raising on failure), plus prefer_cache(). OWMTransport calls
+OpenWeatherMap through owm_client; ServiceTransport calls a server.py
+instance. A cache is anything with get(city) and set(city, value), such as
+weather_cache.TTLCache, or None for no caching.
+
+AsyncWeatherClient offers the same lookups as coroutines, running the
+blocking transport on a bounded thread pool.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from dotenv import load_dotenv
+
+import owm_client
+import service_client
+import tracing
+from city_index import city_index, UnknownCity
+from forecast import aggregate
+from rate_limit import QuotaExceeded
+from weather_cache import weather_cache, forecast_cache
+from weather_logging import get_logger, log_payload
+from weather_records import CurrentConditions, ForecastDay
+from weather_store import store
+
+load_dotenv()
+
+log = get_logger(__name__)
+
+API_KEY = os.getenv("WEATHER_API_KEY")
+
+# Days in a forecast, and 3-hourly slots requested to cover them
+FORECAST_DAYS = 5
+FORECAST_SLOTS = 40
+
+# Where a result came from
+NETWORK = "network"
+CACHE = "cache"
+SAVED = "saved"
+
+
+def is_not_found(err):
+    """True when err means the city does not exist, rather than a failed fetch"""
+    if isinstance(err, UnknownCity):
+        return True
+    response = getattr(err, "response", None)
+    return response is not None and response.status_code == 404
+
+
+def describe_error(err):
+    """One-line, user-facing description of a lookup failure"""
+    if isinstance(err, (UnknownCity, QuotaExceeded, service_client.ServiceError)):
+        return str(err)
+    if is_not_found(err):
+        return "City not found"
+    # HTTPError from raise_for_status carries the response
+    response = getattr(err, "response", None)
+    if response is not None:
+        return f"HTTP {response.status_code}"
+    return str(err) or type(err).__name__
+
+
+class WeatherResult:
+    """Current weather for one city.
+
+    conditions is a CurrentConditions. fetched_at is when it was fetched
+    (None for cache hits). For saved data served after a failed fetch, error
+    is that failure.
+    """
+
+    __slots__ = ("city", "conditions", "source", "fetched_at", "error")
+
+    def __init__(self, city, conditions, source, fetched_at=None, error=None):
+        self.city = city
+        self.conditions = conditions
+        self.source = source
+        self.fetched_at = fetched_at
+        self.error = error
+
+    @property
+    def stale(self):
+        return self.source == SAVED
+
+    def __repr__(self):
+        return f"WeatherResult({self.city!r}, source={self.source!r})"
+
+
+class ForecastResult:
+    """Daily forecast for one city; days are ForecastDay records"""
+
+    __slots__ = ("city", "days", "source", "fetched_at", "error")
+
+    def __init__(self, city, days, source, fetched_at=None, error=None):
+        self.city = city
+        self.days = days
+        self.source = source
+        self.fetched_at = fetched_at
+        self.error = error
+
+    @property
+    def stale(self):
+        return self.source == SAVED
+
+    def __repr__(self):
+        return f"ForecastResult({self.city!r}, {len(self.days)} days, source={self.source!r})"
+
+
+class OWMTransport:
+    """Fetches from OpenWeatherMap through owm_client"""
+
+    def __init__(self, api_key=API_KEY, base_url=None):
+        self.api_key = api_key
+        self.base_url = base_url or owm_client.API_BASE
+
+    def prefer_cache(self):
+        return owm_client.cache_first()
+
+    def _params(self, city):
+        # Known cities are requested by ID, which is unambiguous; unknown
+        # ones raise UnknownCity here without spending a request
+        match = city_index.check(city)
+        params = {
+            "appid": self.api_key,
+            "units": "metric"
+        }
+        if match is not None:
+            params["id"] = match.id
+        else:
+            params["q"] = city
+        return params
+
+    def _get(self, path, params):
+        response = owm_client.get(f"{self.base_url}{path}", params)
+        response.raise_for_status()
+        with tracing.span("json.decode", "parse"):
+            return response.json()
+
+    def current(self, city):
+        data = self._get("/weather", self._params(city))
+        with tracing.span("records.parse", "parse"):
+            return CurrentConditions.from_payload(data)
+
+    def forecast(self, city):
+        params = self._params(city)
+        params["cnt"] = FORECAST_SLOTS
+        data = self._get("/forecast", params)
+        log_payload("forecast", city, data)
+        # One pass over the 3-hourly slots; days follow the city's local date
+        with tracing.span("forecast.aggregate", "parse"):
+            _, daily = aggregate(data)
+            return daily.records(limit=FORECAST_DAYS)
+
+
+class ServiceTransport:
+    """Fetches from a shared weather service (server.py)"""
+
+    def prefer_cache(self):
+        # The service keeps the API budget
+        return False
+
+    def current(self, city):
+        city_index.check(city)
+        return CurrentConditions.from_dict(service_client.weather(city))
+
+    def forecast(self, city):
+        city_index.check(city)
+        return [ForecastDay.from_dict(day) for day in service_client.forecast(city)]
+
+
+def default_transport():
+    """The service when WEATHER_SERVICE_URL is set, else OpenWeatherMap"""
+    return ServiceTransport() if service_client.enabled() else OWMTransport()
+
+
+class WeatherClient:
+    """Blocking weather lookups; safe to share between threads"""
+
+    def __init__(self, transport=None, weather_cache=weather_cache,
+                 forecast_cache=forecast_cache, store=store):
+        self.transport = transport or default_transport()
+        self.weather_cache = weather_cache
+        self.forecast_cache = forecast_cache
+        self.store = store
+
+    def weather(self, city, use_cache=True, fallback=False, limiter=None):
+        """Current weather for city as a WeatherResult.
+
+        use_cache=False refetches unless the API budget is tight. limiter,
+        if given, is only consulted when a request is actually needed.
+        Raises the transport's exception unless fallback finds saved data.
+        """
+        if self.weather_cache is not None and (use_cache or self.transport.prefer_cache()):
+            conditions = self.weather_cache.get(city)
+            if conditions is not None:
+                return WeatherResult(city, conditions, CACHE)
+
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            conditions = self.transport.current(city)
+        except Exception as err:
+            saved = self._saved("weather", city, err) if fallback else None
+            if saved is None:
+                raise
+            return WeatherResult(city, saved[0], SAVED, saved[1], err)
+        self.remember_weather(city, conditions)
+        return WeatherResult(city, conditions, NETWORK, time.time())
+
+    def forecast(self, city, use_cache=True, fallback=False, limiter=None):
+        """Daily forecast for city as a ForecastResult; see weather()"""
+        if self.forecast_cache is not None and (use_cache or self.transport.prefer_cache()):
+            days = self.forecast_cache.get(city)
+            if days is not None:
+                return ForecastResult(city, days, CACHE)
+
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            days = self.transport.forecast(city)
+        except Exception as err:
+            saved = self._saved("forecast", city, err) if fallback else None
+            if saved is None:
+                raise
+            return ForecastResult(city, saved[0], SAVED, saved[1], err)
+        if days:
+            if self.forecast_cache is not None:
+                self.forecast_cache.set(city, days)
+            if self.store is not None:
+                self.store.save("forecast", city, [day.to_dict() for day in days])
+        return ForecastResult(city, days, NETWORK, time.time())
+
+    def remember_weather(self, city, conditions):
+        """Cache and save current weather (a CurrentConditions) fetched for city"""
+        if self.weather_cache is not None:
+            self.weather_cache.set(city, conditions)
+        if self.store is not None:
+            self.store.save("weather", city, conditions.to_dict())
+            if conditions.city_id is not None:
+                self.store.save_city_id(city, conditions.city_id)
+
+    def load_saved(self, kind, city):
+        """(record(s), saved_at) last saved for city, or None.
+
+        kind is "weather" (a CurrentConditions) or "forecast" (a list of
+        ForecastDay).
+        """
+        if self.store is None:
+            return None
+        saved = self.store.load(kind, city)
+        if saved is None:
+            return None
+        data, saved_at = saved
+        if kind == "forecast":
+            return [ForecastDay.from_dict(day) for day in data], saved_at
+        return CurrentConditions.from_dict(data), saved_at
+
+    def _saved(self, kind, city, err):
+        if is_not_found(err):
+            return None
+        saved = self.load_saved(kind, city)
+        if saved is not None:
+            log.info("Serving saved %s for %s after: %s", kind, city, err)
+        return saved
+
+
+class AsyncWeatherClient:
+    """Coroutine front end to a WeatherClient.
+
+    At most max_concurrency blocking lookups run at once; the rest queue.
+    """
+
+    def __init__(self, client=None, max_concurrency=8):
+        self.client = client or WeatherClient()
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="weather")
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def weather(self, city, use_cache=True, fallback=False):
+        return await self._run(self.client.weather, city, use_cache, fallback)
+
+    async def forecast(self, city, use_cache=True, fallback=False):
+        return await self._run(self.client.forecast, city, use_cache, fallback)
+
+    async def lookup(self, city, use_cache=True, fallback=False):
+        """(WeatherResult, ForecastResult) for city, fetched concurrently"""
+        return await asyncio.gather(self.weather(city, use_cache, fallback),
+                                    self.forecast(city, use_cache, fallback))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+# Shared by the CLI, the GUI and the dashboard
+weather_client = WeatherClient()
@@ -0,0 +1,134 @@
+"""Level-gated logging shared by the CLI, the GUI and their helpers.
+
+Modules log through get_logger(__name__) with logging's %-style arguments,
+e.g. log.debug("Forecast for %s: %s", city, days), so a message is only
+formatted when its level is enabled. Raw API payloads can be captured for
+debugging with log_payload(). When capture is off this costs a single level
+check. When it is on, a sample of payloads is written as JSON lines to a
+size-rotated file.
+
+Configuration (environment or .env):
+    WEATHER_LOG_LEVEL             default level, e.g. DEBUG (default WARNING)
+    WEATHER_LOG_LEVELS            per-module levels: "gui_app=DEBUG,http_client=INFO"
+    WEATHER_LOG_PAYLOADS          payload capture file; capture is off when unset
+    WEATHER_LOG_PAYLOAD_SAMPLE    fraction of payloads captured (default 0.1)
+    WEATHER_LOG_PAYLOAD_MAX_BYTES size at which the capture file rotates
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv("WEATHER_LOG_LEVEL", "WARNING")
+LOG_LEVELS = os.getenv("WEATHER_LOG_LEVELS", "")
+PAYLOAD_PATH = os.getenv("WEATHER_LOG_PAYLOADS")
+PAYLOAD_SAMPLE = float(os.getenv("WEATHER_LOG_PAYLOAD_SAMPLE", "0.1"))
+PAYLOAD_MAX_BYTES = int(os.getenv("WEATHER_LOG_PAYLOAD_MAX_BYTES", str(1024 * 1024)))
+PAYLOAD_BACKUPS = 3
+
+# Every app logger lives under this name, leaving the root logger alone
+ROOT_NAME = "weather"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_configured = False
+_configure_lock = threading.Lock()
+_payload_log = logging.getLogger(f"{ROOT_NAME}.payloads")
+
+
+def _level(name):
+    level = logging.getLevelName(name.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {name}")
+    return level
+
+
+def configure(level=None, levels=None, payload_path=None):
+    """Set up handlers and levels; only the first call has any effect.
+
+    Arguments override the matching environment settings. levels is a
+    {module: level} dict.
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+
+        root = logging.getLogger(ROOT_NAME)
+        root.propagate = False
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+        try:
+            root.setLevel(_level(level or LOG_LEVEL))
+        except ValueError as e:
+            root.setLevel(logging.WARNING)
+            root.warning("%s", e)
+
+        if levels is None:
+            levels = dict(
+                item.split("=", 1) for item in LOG_LEVELS.split(",") if "=" in item
+            )
+        for module, module_level in levels.items():
+            try:
+                logging.getLogger(f"{ROOT_NAME}.{module.strip()}").setLevel(_level(module_level))
+            except ValueError as e:
+                root.warning("%s", e)
+
+        # Payload capture goes only to its own file, never to the console
+        _payload_log.propagate = False
+        payload_path = payload_path or PAYLOAD_PATH
+        if payload_path:
+            payload_handler = RotatingFileHandler(
+                payload_path, maxBytes=PAYLOAD_MAX_BYTES,
+                backupCount=PAYLOAD_BACKUPS, encoding="utf-8", delay=True
+            )
+            payload_handler.setFormatter(logging.Formatter("%(message)s"))
+            _payload_log.addHandler(payload_handler)
+            _payload_log.setLevel(logging.DEBUG)
+        else:
+            _payload_log.setLevel(logging.CRITICAL + 1)
+
+
+def get_logger(name):
+    """Return the app logger for a module, configuring logging on first use"""
+    configure()
+    return logging.getLogger(f"{ROOT_NAME}.{name}")
+
+
+class _PayloadRecord:
+    """Serialized to a JSON line only if the record is actually written"""
+
+    __slots__ = ("source", "label", "payload")
+
+    def __init__(self, source, label, payload):
+        self.source = source
+        self.label = label
+        self.payload = payload
+
+    def __str__(self):
+        return json.dumps({
+            "time": time.time(),
+            "source": self.source,
+            "label": self.label,
+            "payload": self.payload,
+        }, separators=(",", ":"), default=str)
+
+
+def log_payload(source, label, payload):
+    """Capture a raw payload for a sample of calls, if capture is enabled"""
+    if not _configured:
+        configure()
+    if not _payload_log.isEnabledFor(logging.DEBUG):
+        return
+    if random.random() >= PAYLOAD_SAMPLE:
+        return
+    _payload_log.debug("%s", _PayloadRecord(source, label, payload))
@@ -0,0 +1,122 @@
+"""Compact records for current conditions and forecast days.
+
+API responses are parsed into these once, as they arrive. Only the fields
+the app displays are kept; the rest of the decoded JSON is dropped straight
+away instead of living on in the caches, the store and the GUI. Records
+hold their fields in __slots__ (no per-object dict). Icon codes,
+descriptions and date labels repeat across cities, so they are interned and
+shared.
+
+Records round-trip through plain dicts (to_dict / from_dict) for the
+on-disk store and the weather service. from_dict also accepts the raw
+OpenWeatherMap payloads and the day dicts saved by earlier versions.
+"""
+import sys
+
+
+class _Record:
+    """Slot-based equality, repr and dict conversion"""
+
+    __slots__ = ()
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _shared(text):
+    return sys.intern(text) if text else ""
+
+
+class CurrentConditions(_Record):
+    """Current weather for one city, temperatures in °C"""
+
+    __slots__ = ("city_id", "name", "observed_at", "temp", "feels_like",
+                 "temp_min", "temp_max", "humidity", "wind_speed", "icon", "description")
+
+    def __init__(self, city_id, name, observed_at, temp, feels_like, temp_min, temp_max,
+                 humidity, wind_speed, icon, description):
+        self.city_id = city_id
+        self.name = name
+        self.observed_at = observed_at
+        self.temp = temp
+        self.feels_like = feels_like
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.icon = _shared(icon)
+        self.description = _shared(description)
+
+    @classmethod
+    def from_payload(cls, data):
+        """Parse an OpenWeatherMap /weather response (or /group entry)"""
+        main = data["main"]
+        weather = (data.get("weather") or [{}])[0]
+        return cls(
+            data.get("id"),
+            data.get("name", ""),
+            data.get("dt"),
+            main["temp"],
+            main.get("feels_like", main["temp"]),
+            main.get("temp_min", main["temp"]),
+            main.get("temp_max", main["temp"]),
+            main.get("humidity"),
+            data.get("wind", {}).get("speed"),
+            weather.get("icon", ""),
+            weather.get("description", ""),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        if "main" in data:
+            return cls.from_payload(data)
+        return cls(*(data.get(name) for name in cls.__slots__))
+
+
+class ForecastDay(_Record):
+    """One day of the daily forecast, temperatures in °C.
+
+    date is the display label, e.g. "Mon, 14 Oct"; icon and description
+    are the day's dominant conditions.
+    """
+
+    __slots__ = ("date", "temp_min", "temp_max", "temp_mean", "precipitation",
+                 "icon", "description")
+
+    def __init__(self, date, temp_min, temp_max, temp_mean, precipitation, icon, description):
+        self.date = _shared(date)
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.temp_mean = temp_mean
+        self.precipitation = precipitation
+        self.icon = _shared(icon)
+        self.description = _shared(description)
+
+    @classmethod
+    def from_dict(cls, data):
+        # Day dicts saved by earlier versions call the description
+        # "weather", and the oldest have a single "temp" for the day
+        temp = data.get("temp", 0.0)
+        return cls(
+            data.get("date", ""),
+            data.get("temp_min", temp),
+            data.get("temp_max", temp),
+            data.get("temp_mean", temp),
+            data.get("precipitation", 0.0),
+            data.get("icon", ""),
+            data.get("description", data.get("weather", "")),
+        )
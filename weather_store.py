@@ -0,0 +1,210 @@
+"""Persistent on-disk store for the last weather and forecast per city.
+
+Backed by SQLite in WAL mode so the CLI and the GUI can read and write it at
+the same time. Each thread gets its own connection. The store is best-effort:
+if the database cannot be used, lookups behave as cache misses and the app
+carries on without it.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from weather_cache import normalize_city
+from weather_logging import get_logger
+
+load_dotenv()
+
+log = get_logger(__name__)
+
+STORE_PATH = os.getenv(
+    "WEATHER_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather_store.db")
+)
+
+# Maximum number of payloads kept on disk; the oldest are pruned first
+STORE_MAX_ENTRIES = int(os.getenv("WEATHER_STORE_MAX_ENTRIES", "200"))
+
+# Seconds to wait for a lock held by another process before giving up
+STORE_BUSY_TIMEOUT = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    kind TEXT NOT NULL,
+    city TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (kind, city)
+);
+CREATE INDEX IF NOT EXISTS payloads_fetched_at ON payloads (fetched_at);
+CREATE TABLE IF NOT EXISTS city_ids (
+    city TEXT PRIMARY KEY,
+    id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS api_usage (
+    day TEXT PRIMARY KEY,
+    calls INTEGER NOT NULL
+);
+"""
+
+
+class WeatherStore:
+    """Last-known weather payloads keyed on (kind, normalized city), plus
+    the OpenWeatherMap ID each city name resolved to"""
+
+    def __init__(self, path=STORE_PATH, max_entries=STORE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=STORE_BUSY_TIMEOUT)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def save(self, kind, city, payload, fetched_at=None):
+        """Store payload for city, replacing any older copy"""
+        if fetched_at is None:
+            fetched_at = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO payloads (kind, city, payload, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (kind, normalize_city(city), json.dumps(payload), fetched_at)
+                )
+                conn.execute(
+                    "DELETE FROM payloads WHERE rowid IN ("
+                    "SELECT rowid FROM payloads ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            log.error("Weather store write failed: %s", e)
+
+    def load(self, kind, city):
+        """Return (payload, fetched_at) for city, or None if nothing is stored"""
+        try:
+            row = self._connect().execute(
+                "SELECT payload, fetched_at FROM payloads WHERE kind = ? AND city = ?",
+                (kind, normalize_city(city))
+            ).fetchone()
+        except sqlite3.Error as e:
+            log.error("Weather store read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def city_ids(self, cities):
+        """Return {normalized city: OpenWeatherMap city ID} for the cities we know"""
+        keys = list({normalize_city(city) for city in cities})
+        ids = {}
+        try:
+            conn = self._connect()
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT city, id FROM city_ids WHERE city IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                ids.update(rows)
+        except sqlite3.Error as e:
+            log.error("Weather store read failed: %s", e)
+        return ids
+
+    def save_city_id(self, city, city_id):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO city_ids (city, id) VALUES (?, ?)",
+                    (normalize_city(city), city_id)
+                )
+        except sqlite3.Error as e:
+            log.error("Weather store write failed: %s", e)
+
+    def get_meta(self, key):
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            log.error("Weather store read failed: %s", e)
+            return None
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+                )
+        except sqlite3.Error as e:
+            log.error("Weather store write failed: %s", e)
+
+    def add_api_calls(self, day, calls=1):
+        """Add to the API call count for day; returns the new total, or None"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO api_usage (day, calls) VALUES (?, ?) "
+                    "ON CONFLICT (day) DO UPDATE SET calls = calls + excluded.calls",
+                    (day, calls)
+                )
+                return conn.execute(
+                    "SELECT calls FROM api_usage WHERE day = ?", (day,)
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            log.error("Weather store write failed: %s", e)
+            return None
+
+    def api_calls(self, day):
+        """Return the API calls counted for day (all processes together)"""
+        try:
+            row = self._connect().execute(
+                "SELECT calls FROM api_usage WHERE day = ?", (day,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            log.error("Weather store read failed: %s", e)
+            return 0
+        return row[0] if row else 0
+
+    def last_city(self):
+        """Return the city shown most recently, if any"""
+        return self.get_meta("last_city")
+
+    def set_last_city(self, city):
+        self.set_meta("last_city", city)
+
+    def compact(self, min_free_ratio=0.25):
+        """Reclaim free pages once enough of the file is unused"""
+        try:
+            conn = self._connect()
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            free_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if page_count and free_count / page_count >= min_free_ratio:
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            # Another process holding the database just means we try next time
+            log.info("Weather store compaction skipped: %s", e)
+
+
+# Shared store used by both the CLI and the GUI
+store = WeatherStore()
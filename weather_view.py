@@ -0,0 +1,92 @@
+"""View-model for the weather display.
+
+Holds the last lookup in canonical metric units together with the widgets
+that show it. Unit and theme toggles re-format and re-colour those widgets in
+place instead of rebuilding the display or fetching again. Widgets only need
+a Tk-style config() method, so this module does not import tkinter.
+"""
+
+
+def convert_temp(temp_c, use_celsius=True):
+    """Convert a Celsius temperature to the selected unit"""
+    if use_celsius:
+        return temp_c, "°C"
+    return (temp_c * 9/5) + 32, "°F"
+
+
+def format_temp(temp_c, use_celsius=True, decimals=1):
+    """Format a Celsius temperature in the selected unit, e.g. "21.4°C" """
+    if not isinstance(temp_c, (int, float)):
+        # Missing values ("N/A") are shown as-is
+        return f"{temp_c}{'°C' if use_celsius else '°F'}"
+    value, unit = convert_temp(temp_c, use_celsius)
+    if decimals == 0:
+        return f"{int(round(value))}{unit}"
+    return f"{round(value, decimals)}{unit}"
+
+
+class WeatherViewModel:
+    """Last fetched weather plus the widgets bound to it"""
+
+    def __init__(self, colors, use_celsius=True):
+        self.colors = colors
+        self.use_celsius = use_celsius
+        self.city = None
+        self.current = None
+        self.forecast = None
+        self.stale_since = None
+        self._color_bindings = []
+        self._temp_bindings = []
+
+    def load(self, city, current, forecast=None, stale_since=None):
+        """Replace the displayed data; bindings to the old widgets are dropped"""
+        self.city = city
+        self.current = current
+        self.forecast = forecast
+        self.stale_since = stale_since
+        self.clear()
+
+    def clear(self):
+        """Forget the current widgets, e.g. once they have been destroyed"""
+        self._color_bindings = []
+        self._temp_bindings = []
+
+    def bind_colors(self, widget, **roles):
+        """Colour widget options from theme keys, e.g. bg='surface'.
+
+        The widget is coloured now and again on every apply_theme().
+        """
+        self._color_bindings.append((widget, roles))
+        widget.config(**{option: self.colors[key] for option, key in roles.items()})
+        return widget
+
+    def bind_temp(self, widget, temps, template="{}", decimals=1):
+        """Show one or more Celsius temperatures in widget's text.
+
+        temps is a single value or a tuple filling the {} slots of template.
+        The text is re-formatted on every apply_units().
+        """
+        if not isinstance(temps, tuple):
+            temps = (temps,)
+        binding = (widget, temps, template, decimals)
+        self._temp_bindings.append(binding)
+        self._format_temp_binding(binding)
+        return widget
+
+    def apply_theme(self, colors):
+        """Re-colour every bound widget with the given theme"""
+        self.colors = colors
+        for widget, roles in self._color_bindings:
+            widget.config(**{option: colors[key] for option, key in roles.items()})
+
+    def apply_units(self, use_celsius):
+        """Re-format every bound temperature in the given unit"""
+        self.use_celsius = use_celsius
+        for binding in self._temp_bindings:
+            self._format_temp_binding(binding)
+
+    def _format_temp_binding(self, binding):
+        widget, temps, template, decimals = binding
+        widget.config(text=template.format(
+            *(format_temp(t, self.use_celsius, decimals) for t in temps)
+        ))